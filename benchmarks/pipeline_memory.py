@@ -0,0 +1,50 @@
+"""
+Peak memory of the DataFrame pipeline (build_spread -> generate_signals ->
+backtest_pair, keeping every stage's frame as the scripts do) against the
+columnar pipeline (pairs_bot/columnar.py) on one large synthetic pair:
+
+    python -m benchmarks.pipeline_memory --bars 2000000
+"""
+import argparse
+import time
+import warnings
+
+from benchmarks.run_benchmarks import SEED, LOOKBACK, _peak_mb
+from pairs_bot.backtest import backtest_pair
+from pairs_bot.columnar import run_pipeline
+from pairs_bot.signals import generate_signals
+from pairs_bot.spread_model import build_spread
+from pairs_bot.synthetic import cointegrated_pair
+
+
+def _frames(pair):
+    df_spread = build_spread(pair, LOOKBACK)
+    df_signals = generate_signals(df_spread)
+    return df_spread, df_signals, backtest_pair(df_signals)
+
+
+def _columnar(pair):
+    return run_pipeline(pair, LOOKBACK)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Peak memory: DataFrame vs columnar pipeline.")
+    p.add_argument("--bars", type=int, default=1_000_000)
+    args = p.parse_args()
+    warnings.simplefilter("ignore")
+
+    pair = cointegrated_pair(n_bars=args.bars, seed=SEED, freq="min")
+    input_mb = pair.memory_usage(index=True).sum() / 1e6
+    print(f"{args.bars:,} bars, input frame {input_mb:.1f} MB")
+    peaks = {}
+    for name, fn in (("frames", _frames), ("columnar", _columnar)):
+        start = time.perf_counter()
+        fn(pair)
+        seconds = time.perf_counter() - start
+        peaks[name] = _peak_mb(lambda: fn(pair))
+        print(f"{name:<10} {seconds:>8.2f} s {peaks[name]:>10.1f} MB peak")
+    print(f"reduction  x{peaks['frames'] / peaks['columnar']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Offline benchmark suite on synthetic data (pairs_bot/synthetic.py).
+
+Times the research pipeline stages across data sizes and records wall time,
+throughput and peak traced memory to JSON, so two commits can be compared:
+
+    python -m benchmarks.run_benchmarks --output bench_base.json
+    ... change code ...
+    python -m benchmarks.run_benchmarks --compare bench_base.json
+
+--compare exits with status 1 if any case got slower than --tolerance.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pairs_bot.backtest import backtest_pair
+from pairs_bot.metrics import compute_performance_metrics, performance_metrics
+from pairs_bot.pairs_selection import find_cointegrated_pairs
+from pairs_bot.signals import generate_signals
+from pairs_bot.spread_model import build_spread
+from pairs_bot.synthetic import cointegrated_pair, synthetic_universe
+
+SEED = 7
+LOOKBACK = 60
+
+# scale -> (bars per pair for the per-pair stages, (tickers, bars) for the scan)
+SCALES = {
+    "small": (1_000, (10, 500)),
+    "medium": (10_000, (30, 1_000)),
+    "large": (100_000, (60, 1_500)),
+}
+
+
+def _cases(scale):
+    n_bars, (n_tickers, scan_bars) = SCALES[scale]
+    pair = cointegrated_pair(n_bars=n_bars, seed=SEED)
+    spread = build_spread(pair, LOOKBACK)
+    signals = generate_signals(spread)
+    equity = backtest_pair(signals)["df"]["equity"]
+    returns = equity.pct_change().fillna(0.0)
+    # scan_bars x (n_tickers * 10) block of strategies for the block scorer
+    rng = np.random.default_rng(SEED)
+    strategies = 100.0 * np.cumprod(1 + rng.normal(0.0, 0.01, (scan_bars, n_tickers * 10)), axis=0)
+    strategy_pos = np.sign(rng.normal(size=strategies.shape)) * (rng.random(strategies.shape) < 0.05)
+    universe, _ = synthetic_universe(n_tickers=n_tickers, n_bars=scan_bars, seed=SEED)
+    n_scan = n_tickers * (n_tickers - 1) // 2
+
+    # name -> (callable, work units per call, unit)
+    return {
+        "find_cointegrated_pairs": (lambda: find_cointegrated_pairs(universe), n_scan, "pairs"),
+        "find_cointegrated_pairs_scan": (
+            lambda: find_cointegrated_pairs(universe, n_jobs=1), n_scan, "pairs",
+        ),
+        "find_cointegrated_pairs_fast": (
+            lambda: find_cointegrated_pairs(universe, method="fast"), n_scan, "pairs",
+        ),
+        "build_spread": (lambda: build_spread(pair, LOOKBACK), n_bars, "rows"),
+        "build_spread_kalman": (lambda: build_spread(pair, LOOKBACK, method="kalman"), n_bars, "rows"),
+        "generate_signals": (lambda: generate_signals(spread), n_bars, "rows"),
+        "backtest_pair": (lambda: backtest_pair(signals), n_bars, "rows"),
+        "compute_performance_metrics": (
+            lambda: compute_performance_metrics(equity, returns), n_bars, "rows",
+        ),
+        "performance_metrics_block": (
+            lambda: performance_metrics(strategies, strategy_pos), strategies.size, "cells",
+        ),
+    }
+
+
+def _time(fn, repeats):
+    # best of `repeats`: the least noisy estimate of the code's own cost
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_mb(fn):
+    # separate run: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales, repeats=3, cases=None):
+    results = {}
+    for scale in scales:
+        for name, (fn, work, unit) in _cases(scale).items():
+            if cases and name not in cases:
+                continue
+            fn()  # warm caches (imports, p-value surfaces) outside the timing
+            seconds = _time(fn, repeats)
+            key = f"{name}[{scale}]"
+            results[key] = {
+                "seconds": seconds,
+                "throughput": work / seconds if seconds > 0 else float("inf"),
+                "unit": f"{unit}/s",
+                "peak_mb": _peak_mb(fn),
+            }
+            print(
+                f"{key:<42} {seconds * 1000:>10.2f} ms "
+                f"{results[key]['throughput']:>14,.0f} {unit}/s {results[key]['peak_mb']:>9.1f} MB"
+            )
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "time": pd.Timestamp.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.2):
+    """
+    Print the time ratio of every case present in both runs; returns the
+    cases slower than 1 + tolerance.
+    """
+    regressions = []
+    print(f"\nvs baseline {baseline['meta'].get('commit')} ({baseline['meta'].get('time')})")
+    for key, res in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        ratio = res["seconds"] / base["seconds"]
+        mem = res["peak_mb"] - base["peak_mb"]
+        flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{key:<42} x{ratio:>6.2f} time {mem:>+9.1f} MB{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark the pairs_bot pipeline on synthetic data.")
+    p.add_argument("--scales", default="small,medium", help=f"Comma-separated, from {list(SCALES)}.")
+    p.add_argument("--cases", default=None, help="Comma-separated case names (default: all).")
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--output", default=None, help="Write results JSON here.")
+    p.add_argument("--compare", default=None, help="Baseline JSON to compare against.")
+    p.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging.")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    warnings.simplefilter("ignore")  # statsmodels deprecation noise
+    current = run(
+        args.scales.split(","),
+        repeats=args.repeats,
+        cases=set(args.cases.split(",")) if args.cases else None,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
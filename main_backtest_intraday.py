@@ -0,0 +1,44 @@
+import pandas as pd
+
+from pairs_bot.config import (
+    LOOKBACK_SPREAD, ENTRY_Z, EXIT_Z, STOP_Z,
+    INITIAL_CAPITAL, TRANSACTION_COST_BPS, PRICE_CACHE_DIR,
+)
+from pairs_bot.data_loader import download_prices, align_pair
+from pairs_bot.intraday import backtest_pair_chunked, regular_hours
+from pairs_bot.plotting import plot_equity_curve
+
+
+PAIR_X = "XLE"
+PAIR_Y = "XOM"
+INTERVAL = "1m"        # yfinance serves 1-minute bars for the last ~30 days only
+HISTORY_DAYS = 28
+FLAT_OVERNIGHT = True  # close out at every session end
+
+
+def main():
+    end = pd.Timestamp.today().normalize()
+    start = end - pd.Timedelta(days=HISTORY_DAYS)
+    prices = download_prices([PAIR_X, PAIR_Y], start, end, cache_dir=PRICE_CACHE_DIR, interval=INTERVAL)
+    df_pair = align_pair(regular_hours(prices), PAIR_X, PAIR_Y)
+
+    result = backtest_pair_chunked(
+        df_pair,
+        lookback=LOOKBACK_SPREAD,
+        entry_z=ENTRY_Z, exit_z=EXIT_Z, stop_z=STOP_Z,
+        initial_capital=INITIAL_CAPITAL,
+        tc_bps=TRANSACTION_COST_BPS,
+        flat_overnight=FLAT_OVERNIGHT,
+    )
+    stats = result["stats"]
+
+    print(f"Intraday backtest ({INTERVAL}, {len(df_pair)} bars): ")
+    print(f"Total return: {stats['total_return']*100:.2f}%")
+    print(f"Sharpe ratio: {stats['sharpe']:.2f}")
+    print(f"Max drawdown: {stats['max_drawdown']*100:.2f}%")
+
+    plot_equity_curve(result["df"], title=f"Intraday Equity Curve: {PAIR_X} - {PAIR_Y}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from pairs_bot.config import (
     START_DATE, END_DATE, LOOKBACK_SPREAD,
     ENTRY_Z, EXIT_Z, STOP_Z,
-    INITIAL_CAPITAL, TRANSACTION_COST_BPS,
+    INITIAL_CAPITAL, TRANSACTION_COST_BPS, PRICE_CACHE_DIR, SPREAD_MODEL,
 )
 from pairs_bot.data_loader import download_prices, align_pair
 from pairs_bot.spread_model import build_spread
@@ -14,9 +14,9 @@ PAIR_X = "XLE"
 PAIR_Y = "XOM"
 
 def main():
-    prices = download_prices([PAIR_X, PAIR_Y],START_DATE, END_DATE)
+    prices = download_prices([PAIR_X, PAIR_Y],START_DATE, END_DATE, cache_dir=PRICE_CACHE_DIR)
     df_pair = align_pair(prices, PAIR_X, PAIR_Y)
-    df_spread = build_spread(df_pair, lookback=LOOKBACK_SPREAD)
+    df_spread = build_spread(df_pair, lookback=LOOKBACK_SPREAD, method=SPREAD_MODEL)
     df_signals = generate_signals(df_spread, entry_z=ENTRY_Z, exit_z=EXIT_Z, stop_z=STOP_Z)
     
     result = backtest_pair(df_signals, initial_capital=INITIAL_CAPITAL, tc_bps=TRANSACTION_COST_BPS)
@@ -27,7 +27,10 @@ def main():
     print("Backtest Results: ")
     print(f"Total return: {stats['total_return']*100:.2f}%")
     print(f"Sharpe ratio: {stats['sharpe']:.2f}")
-    print(f"Max drawdown: {stats['max_drawdown']*100:.2f}%")
+    print(f"Max drawdown: {stats['max_drawdown']*100:.2f}% ({stats['max_drawdown_bars']:.0f} bars)")
+    print(f"Sortino: {stats['sortino']:.2f} | Calmar: {stats['calmar']:.2f}")
+    print(f"Trades: {stats['n_trades']:.0f} | hit rate {stats['hit_rate']*100:.1f}% "
+          f"| avg hold {stats['avg_holding_bars']:.1f} bars | costs ${stats['total_tc']:.2f}")
     
     plot_equity_curve(result["df"], title=f"Equity Curve: {PAIR_X} - {PAIR_Y}")
     
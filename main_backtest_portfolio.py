@@ -0,0 +1,52 @@
+from pairs_bot.config import (
+    UNIVERSE, START_DATE, END_DATE, PRICE_CACHE_DIR,
+    MAX_COINTEGRATION_PVALUE, MIN_CORRELATION,
+    LOOKBACK_SPREAD, ENTRY_Z, EXIT_Z, STOP_Z,
+    INITIAL_CAPITAL, TRANSACTION_COST_BPS,
+)
+from pairs_bot.data_loader import download_prices
+from pairs_bot.pairs_selection import find_cointegrated_pairs
+from pairs_bot.portfolio_backtest import backtest_pairs
+from pairs_bot.plotting import plot_equity_curve
+
+
+def main():
+    min_samples = 500
+
+    prices = download_prices(UNIVERSE, START_DATE, END_DATE, cache_dir=PRICE_CACHE_DIR)
+    prices = prices.dropna(axis=1, thresh=min_samples)
+    pairs = find_cointegrated_pairs(
+        prices,
+        max_pvalue=MAX_COINTEGRATION_PVALUE,
+        min_corr=MIN_CORRELATION,
+        min_samples=min_samples
+    )
+    if not pairs:
+        print("No cointegrated pairs found.")
+        return
+
+    result = backtest_pairs(
+        prices,
+        [(p["x"], p["y"]) for p in pairs],
+        lookback=LOOKBACK_SPREAD,
+        entry_z=ENTRY_Z, exit_z=EXIT_Z, stop_z=STOP_Z,
+        initial_capital=INITIAL_CAPITAL,
+        tc_bps=TRANSACTION_COST_BPS,
+    )
+
+    print("Per-pair results:")
+    for p, stats in zip(pairs, result["stats"]):
+        print(f"{p['x']} - {p['y']} | return={stats['total_return']*100:.2f}% "
+              f"| sharpe={stats['sharpe']:.2f} | max_dd={stats['max_drawdown']*100:.2f}%")
+
+    stats = result["portfolio"]["stats"]
+    print("Portfolio: ")
+    print(f"Total return: {stats['total_return']*100:.2f}%")
+    print(f"Sharpe ratio: {stats['sharpe']:.2f}")
+    print(f"Max drawdown: {stats['max_drawdown']*100:.2f}%")
+
+    plot_equity_curve(result["portfolio"]["equity"].to_frame("equity"), title="Portfolio Equity Curve")
+
+
+if __name__ == "__main__":
+    main()
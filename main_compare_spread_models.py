@@ -0,0 +1,45 @@
+import time
+
+from pairs_bot.config import (
+    START_DATE, END_DATE, LOOKBACK_SPREAD,
+    ENTRY_Z, EXIT_Z, STOP_Z,
+    INITIAL_CAPITAL, TRANSACTION_COST_BPS, PRICE_CACHE_DIR,
+)
+from pairs_bot.data_loader import download_prices, align_pair
+from pairs_bot.spread_model import build_spread, KALMAN_DELTA
+from pairs_bot.signals import generate_signals
+from pairs_bot.backtest import backtest_pair
+
+
+# (x, y) pairs to compare the hedge-ratio models on
+PAIRS = [("XLE", "XOM"), ("XOM", "CVX"), ("V", "MA"), ("JPM", "BAC")]
+MODELS = {
+    "rolling": {"method": "rolling"},
+    "kalman": {"method": "kalman", "delta": KALMAN_DELTA},
+}
+REPEATS = 5
+
+
+def main():
+    tickers = sorted({t for pair in PAIRS for t in pair})
+    prices = download_prices(tickers, START_DATE, END_DATE, cache_dir=PRICE_CACHE_DIR)
+
+    print(f"{'pair':<10} {'model':<8} {'spread ms':>10} {'sharpe':>8} {'return':>8} {'max dd':>8}")
+    for x, y in PAIRS:
+        df_pair = align_pair(prices, x, y)
+        for name, kwargs in MODELS.items():
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                df_spread = build_spread(df_pair, lookback=LOOKBACK_SPREAD, **kwargs)
+            elapsed = (time.perf_counter() - start) / REPEATS * 1000
+
+            df_signals = generate_signals(df_spread, entry_z=ENTRY_Z, exit_z=EXIT_Z, stop_z=STOP_Z)
+            stats = backtest_pair(df_signals, initial_capital=INITIAL_CAPITAL, tc_bps=TRANSACTION_COST_BPS)["stats"]
+            print(
+                f"{x + '-' + y:<10} {name:<8} {elapsed:>10.2f} {stats['sharpe']:>8.2f} "
+                f"{stats['total_return']*100:>7.2f}% {stats['max_drawdown']*100:>7.2f}%"
+            )
+
+
+if __name__ == "__main__":
+    main()
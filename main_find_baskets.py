@@ -0,0 +1,39 @@
+import time
+
+from pairs_bot.config import UNIVERSE, START_DATE, END_DATE, PRICE_CACHE_DIR, SECTORS
+from pairs_bot.data_loader import download_prices
+from pairs_bot.pairs_selection import basket_candidates, find_cointegrated_baskets, find_cointegrated_pairs
+
+
+def main():
+    min_samples = 500
+
+    prices = download_prices(UNIVERSE, START_DATE, END_DATE, cache_dir=PRICE_CACHE_DIR)
+    prices = prices.dropna(axis=1, thresh=min_samples)
+
+    groups = basket_candidates(prices, sizes=(3, 4), sectors=SECTORS)
+    start = time.perf_counter()
+    baskets = find_cointegrated_baskets(prices, groups=groups, min_samples=min_samples)
+    basket_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = find_cointegrated_pairs(prices, min_samples=min_samples)
+    pair_seconds = time.perf_counter() - start
+
+    print(
+        f"Basket scan: {len(groups)} groups in {basket_seconds:.1f}s, {len(baskets)} cointegrated | "
+        f"pair scan: {len(pairs)} pairs in {pair_seconds:.1f}s"
+    )
+    print("Cointegrated baskets:")
+    if not baskets:
+        print("  (none found)")
+    for b in baskets:
+        weights = ", ".join(f"{w:+.2f}" for w in b["weights"])
+        print(
+            f"{' / '.join(b['tickers'])} | trace={b['trace_stat']:.1f} (95%: {b['crit_95']:.1f}) "
+            f"| rank={b['rank']} | w=[{weights}] | adf_p={b['adf_p']:.4f} | hurst={b['hurst']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,45 @@
 from pairs_bot.config import (
-    UNIVERSE, START_DATE, END_DATE,
-    MAX_COINTEGRATION_PVALUE, MIN_CORRELATION,
+    UNIVERSE, START_DATE, END_DATE, PRICE_CACHE_DIR, SCAN_CACHE_DIR,
+    MAX_COINTEGRATION_PVALUE, MIN_CORRELATION, SECTORS,
 )
 from pairs_bot.data_loader import download_prices
-from pairs_bot.pairs_selection import find_cointegrated_pairs
+from pairs_bot.pairs_selection import cluster_candidates, find_cointegrated_pairs, pruning_report
+from pairs_bot.scan_cache import ScanCache
+
+# test only pairs inside return-correlation clusters / sectors / top-k
+# neighbours, and print how many exhaustive-scan pairs that recovers
+CLUSTER_PRUNING = False
 
 
 def main():
     min_samples = 500
     
-    prices = download_prices(UNIVERSE, START_DATE, END_DATE)
+    cache = ScanCache(SCAN_CACHE_DIR) if SCAN_CACHE_DIR is not None else None
+    prices = download_prices(
+        UNIVERSE, START_DATE, END_DATE, cache_dir=PRICE_CACHE_DIR,
+        on_update=cache.invalidate if cache is not None else None,
+    )
     prices = prices.dropna(axis=1, thresh=min_samples)
-    pairs = find_cointegrated_pairs(
-        prices,
+    scan_kwargs = dict(
         max_pvalue=MAX_COINTEGRATION_PVALUE,
         min_corr=MIN_CORRELATION,
         min_samples=min_samples
     )
+    candidates = None
+    if CLUSTER_PRUNING:
+        candidates = cluster_candidates(prices, sectors=SECTORS)
+        report = pruning_report(prices, candidates, **scan_kwargs)
+        print(
+            f"Cluster pruning: {report['candidate_pairs']}/{report['all_pairs']} pairs tested, "
+            f"recovered {report['recovered']}/{report['exhaustive_found']} "
+            f"(recall {report['recall']:.2f}; "
+            f"{report['pruned_seconds']:.1f}s vs {report['exhaustive_seconds']:.1f}s)"
+        )
+        for x, y in report["missed"]:
+            print(f"  dropped by pruning: {x} - {y}")
+    pairs = find_cointegrated_pairs(prices, candidates=candidates, cache=cache, **scan_kwargs)
+    if cache is not None:
+        print(f"Scan cache: {cache.hits} pairs reused, {cache.misses} tested")
     
     print("Cointegrated pairs:")
     if not pairs:
@@ -26,4 +49,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
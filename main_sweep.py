@@ -0,0 +1,37 @@
+from pairs_bot.config import (
+    START_DATE, END_DATE, PRICE_CACHE_DIR, INITIAL_CAPITAL,
+)
+from pairs_bot.data_loader import download_prices
+from pairs_bot.sweep import run_sweep
+
+
+PAIR_X = "XLE"
+PAIR_Y = "XOM"
+
+LOOKBACKS = [30, 60, 90, 120]
+ENTRY_ZS = [1.5, 2.0, 2.5, 3.0]
+EXIT_ZS = [0.0, 0.4, 0.8]
+STOP_ZS = [3.5, 4.0, 5.0]
+TC_BPS = [2, 5]
+
+
+def main():
+    prices = download_prices([PAIR_X, PAIR_Y], START_DATE, END_DATE, cache_dir=PRICE_CACHE_DIR)
+    results = run_sweep(
+        prices,
+        [(PAIR_X, PAIR_Y)],
+        lookbacks=LOOKBACKS,
+        entry_zs=ENTRY_ZS,
+        exit_zs=EXIT_ZS,
+        stop_zs=STOP_ZS,
+        tc_bps=TC_BPS,
+        initial_capital=INITIAL_CAPITAL,
+        n_jobs=-1,
+    )
+
+    print(f"Top combinations by Sharpe ({len(results)} evaluated):")
+    print(results.sort_values("sharpe", ascending=False).head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from pairs_bot.config import (
+    UNIVERSE, START_DATE, END_DATE, PRICE_CACHE_DIR,
+    MAX_COINTEGRATION_PVALUE, MIN_CORRELATION,
+    LOOKBACK_SPREAD, ENTRY_Z, EXIT_Z, STOP_Z,
+    INITIAL_CAPITAL, TRANSACTION_COST_BPS,
+)
+from pairs_bot.data_loader import download_prices
+from pairs_bot.walk_forward import walk_forward, WalkForwardCache
+from pairs_bot.plotting import plot_equity_curve
+
+
+FORMATION_DAYS = 504   # ~2 trading years to pick pairs
+TRADING_DAYS = 126     # ~6 months out of sample
+MAX_PAIRS = 10
+WALK_FORWARD_CACHE_DIR = ".walk_forward_cache"
+
+
+def main():
+    prices = download_prices(UNIVERSE, START_DATE, END_DATE, cache_dir=PRICE_CACHE_DIR)
+    result = walk_forward(
+        prices,
+        formation=FORMATION_DAYS,
+        trading=TRADING_DAYS,
+        lookback=LOOKBACK_SPREAD,
+        entry_z=ENTRY_Z, exit_z=EXIT_Z, stop_z=STOP_Z,
+        initial_capital=INITIAL_CAPITAL,
+        tc_bps=TRANSACTION_COST_BPS,
+        max_pairs=MAX_PAIRS,
+        scan_kwargs={
+            "max_pvalue": MAX_COINTEGRATION_PVALUE,
+            "min_corr": MIN_CORRELATION,
+            "min_samples": 400,
+            "n_jobs": -1,
+        },
+        cache=WalkForwardCache(WALK_FORWARD_CACHE_DIR),
+    )
+
+    for w in result["windows"]:
+        names = ", ".join(f"{p['x']}-{p['y']}" for p in w["pairs"]) or "(none)"
+        print(f"{w['trade_start']:%Y-%m-%d} -> {w['trade_end']:%Y-%m-%d}: {names}")
+
+    stats = result["stats"]
+    if not stats:
+        print("Not enough data for a single walk-forward window.")
+        return
+    print("Out-of-sample results: ")
+    print(f"Total return: {stats['total_return']*100:.2f}%")
+    print(f"Sharpe ratio: {stats['sharpe']:.2f}")
+    print(f"Max drawdown: {stats['max_drawdown']*100:.2f}%")
+
+    plot_equity_curve(result["equity"].to_frame("equity"), title="Walk-forward Equity Curve")
+
+
+if __name__ == "__main__":
+    main()
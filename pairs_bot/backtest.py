@@ -1,49 +1,136 @@
 import numpy as np
-import pandas as pd
-from pairs_bot.metrics import compute_performance_metrics
+from pairs_bot.metrics import infer_periods_per_year, performance_metrics
 
-def backtest_pair(df, initial_capital=100000, tc_bps=2.0):
-    df = df.copy().dropna(subset=["position"])
-    
-    df["ret_X"] = df["X"].pct_change().fillna(0.0)
-    df["ret_Y"] = df["Y"].pct_change().fillna(0.0)
 
-    equity = initial_capital
-    equities = [equity]
-    pos_Y = [0.0]
-    pos_X = [0.0]
+def backtest_arrays(position, beta, ret_x, ret_y, initial_capital=100000, tc_bps=2.0, start=None):
+    """
+    Array kernel behind backtest_pair. Inputs are aligned 1-D arrays; returns
+    preallocated (pos_Y, pos_X, tc, equity) arrays.
+
+    start: (equity, pos_Y, pos_X) at row 0, to continue an earlier run over
+    the next block of rows (the notional cap still comes from
+    initial_capital). By default row 0 is flat at initial_capital.
+
+    The notional cap depends on yesterday's equity, so the recursion stays a
+    loop, but all per-step inputs are precomputed and the loop only touches
+    Python floats.
+    """
+    position = np.asarray(position, dtype=float)
+    n = len(position)
     tc = tc_bps / 10000
-    tc_costs = [0.0]
-    
-    for i in range(1, len(df)):
-        equity_now = equities[-1]
+    cap = initial_capital * 1.2
+
+    pos_Y = np.zeros(n)
+    pos_X = np.zeros(n)
+    tc_costs = np.zeros(n)
+    equities = np.empty(n)
+    if n == 0:
+        return pos_Y, pos_X, tc_costs, equities
+
+    hedge = -position * np.asarray(beta, dtype=float)
+    pos_l = position.tolist()
+    hedge_l = hedge.tolist()
+    rx = np.asarray(ret_x, dtype=float).tolist()
+    ry = np.asarray(ret_y, dtype=float).tolist()
+    py = [0.0] * n
+    px = [0.0] * n
+    costs = [0.0] * n
+    eq = [0.0] * n
+
+    equity_now = float(initial_capital)
+    prev_y = 0.0
+    prev_x = 0.0
+    if start is not None:
+        equity_now, prev_y, prev_x = (float(v) for v in start)
+    eq[0] = equity_now
+    py[0] = prev_y
+    px[0] = prev_x
+    for i in range(1, n):
         # Cap gross notional to avoid ballooning exposure when equity drops
-        notional = min(equity_now, initial_capital * 1.2)
+        notional = equity_now if equity_now < cap else cap
 
         # set positions for day i based on yesterday's state
-        y_pos = df["position"].iloc[i] * notional
-        x_pos = -df["position"].iloc[i] * df["beta"].iloc[i] * notional
-        pos_Y.append(y_pos)
-        pos_X.append(x_pos)
-
-        pnl_y = pos_Y[-2] * df["ret_Y"].iloc[i]
-        pnl_x = pos_X[-2] * df["ret_X"].iloc[i]
-        trade_y = abs(pos_Y[-1] - pos_Y[-2])
-        trade_x = abs(pos_X[-1] - pos_X[-2])
-        trade_cost = -tc * (trade_y + trade_x)
-        tc_costs.append(trade_cost)
-
-        equity_next = equity_now + pnl_y + pnl_x + trade_cost
-        equities.append(equity_next)
-        
-
-    df["pos_Y"] = pd.Series(pos_Y, index=df.index)
-    df["pos_X"] = pd.Series(pos_X, index=df.index)
-    df["tc"] = pd.Series(tc_costs, index=df.index)
-    df["equity"] = pd.Series(equities, index=df.index)
+        y_pos = pos_l[i] * notional
+        x_pos = hedge_l[i] * notional
+
+        trade_cost = -tc * (abs(y_pos - prev_y) + abs(x_pos - prev_x))
+        equity_now = equity_now + prev_y * ry[i] + prev_x * rx[i] + trade_cost
+
+        py[i] = y_pos
+        px[i] = x_pos
+        costs[i] = trade_cost
+        eq[i] = equity_now
+        prev_y = y_pos
+        prev_x = x_pos
+
+    pos_Y[:] = py
+    pos_X[:] = px
+    tc_costs[:] = costs
+    equities[:] = eq
+    return pos_Y, pos_X, tc_costs, equities
+
+
+def backtest_block(position, beta, ret_x, ret_y, initial_capital=100000, tc_bps=2.0):
+    """
+    backtest_arrays over a (time, pair) block, stepping every pair at once.
+    Same arithmetic per element as the 1-D kernel, so each column matches a
+    single-pair run exactly. NaN rows at the end of a column stay NaN.
+    """
+    position = np.asarray(position, dtype=float)
+    hedge = -position * np.asarray(beta, dtype=float)
+    ret_x = np.asarray(ret_x, dtype=float)
+    ret_y = np.asarray(ret_y, dtype=float)
+    tc = tc_bps / 10000
+    cap = initial_capital * 1.2
+
+    pos_Y = np.zeros(position.shape)
+    pos_X = np.zeros(position.shape)
+    tc_costs = np.zeros(position.shape)
+    equities = np.empty(position.shape)
+    if len(position) == 0:
+        return pos_Y, pos_X, tc_costs, equities
+
+    equities[0] = initial_capital
+    for i in range(1, len(position)):
+        equity_now = equities[i - 1]
+        notional = np.minimum(equity_now, cap)
+        y_pos = position[i] * notional
+        x_pos = hedge[i] * notional
+        pos_Y[i] = y_pos
+        pos_X[i] = x_pos
+        tc_costs[i] = -tc * (np.abs(y_pos - pos_Y[i - 1]) + np.abs(x_pos - pos_X[i - 1]))
+        equities[i] = equity_now + pos_Y[i - 1] * ret_y[i] + pos_X[i - 1] * ret_x[i] + tc_costs[i]
+    return pos_Y, pos_X, tc_costs, equities
+
+
+def backtest_pair(df, initial_capital=100000, tc_bps=2.0, periods_per_year=None):
+    # periods_per_year annualizes the stats; by default it is inferred from
+    # the bar spacing of df's index (252 for daily closes). stats are
+    # metrics.performance_metrics: compute_performance_metrics' keys plus
+    # Sortino, Calmar, drawdown duration, turnover, costs and trade stats
+    df = df.copy().dropna(subset=["position"])
+
+    df["ret_X"] = df["X"].pct_change().fillna(0.0)
+    df["ret_Y"] = df["Y"].pct_change().fillna(0.0)
+
+    pos_Y, pos_X, tc_costs, equities = backtest_arrays(
+        df["position"].values,
+        df["beta"].values,
+        df["ret_X"].values,
+        df["ret_Y"].values,
+        initial_capital=initial_capital,
+        tc_bps=tc_bps,
+    )
+
+    df["pos_Y"] = pos_Y
+    df["pos_X"] = pos_X
+    df["tc"] = tc_costs
+    df["equity"] = equities
     df["returns"] = df["equity"].pct_change().fillna(0.0)
 
-    stats = compute_performance_metrics(df["equity"], df["returns"])
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(df.index)
+    stats = performance_metrics(df["equity"], df["position"], df["tc"], trading_days=periods_per_year)
     return {"df": df, 
             "stats": stats
             }
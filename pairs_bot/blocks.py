@@ -0,0 +1,101 @@
+"""
+Block driver shared by the chunked pipelines (intraday.backtest_pair_chunked
+and the columnar stages): block bounds on rolling_hedge_ratio's segment grid,
+the rolling hedge / spread / z-score of each block with enough warm-up rows
+to match a single pass, and the signal state and equity carried from one
+block into the next.
+
+Every block is handed over as rows [first, hi) with first = c - 1 (0 for
+the first block): row c - 1, the last row of the previous block, carries
+the state in, and the block's own rows start at offset c - first.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from pairs_bot.backtest import backtest_arrays
+from pairs_bot.signals import signal_positions
+from pairs_bot.spread_model import _SEGMENT, rolling_hedge_ratio
+
+
+def block_bounds(n, chunk_rows):
+    """
+    (c, hi) row ranges of about `chunk_rows` rows covering n rows. Block
+    starts sit on rolling_hedge_ratio's segment grid, so a block plus a
+    whole-segment warm-up prefix reproduces the single-pass window sums.
+    """
+    chunk_rows = _SEGMENT * max(1, math.ceil(chunk_rows / _SEGMENT))
+    return [(c, min(n, c + chunk_rows)) for c in range(0, n, chunk_rows)]
+
+
+def warmup_rows(lookback):
+    """
+    Rows of history a block needs before its first row: the z-score there
+    needs `lookback` spreads, each with its own full `lookback`-row hedge
+    window, i.e. 2 * lookback - 1 rows, rounded up to whole segments.
+    """
+    return _SEGMENT * math.ceil((2 * lookback - 1) / _SEGMENT)
+
+
+def spread_blocks(x, y, lookback, chunk_rows):
+    """
+    Rolling build_spread over x / y arrays, one block at a time.
+    Yields (first, c, hi, alpha, beta, spread, zscore) with float64 arrays
+    over rows [first, hi).
+    """
+    prefix = warmup_rows(lookback)
+    for c, hi in block_bounds(len(x), chunk_rows):
+        lo = max(0, c - prefix)
+        xs, ys = x[lo:hi], y[lo:hi]
+        alpha, beta = rolling_hedge_ratio(ys, xs, lookback)
+        spread = ys - (alpha + beta * xs)
+        rolling = pd.Series(spread).rolling(lookback)
+        z = (spread - rolling.mean().to_numpy()) / rolling.std().to_numpy()
+        first = max(c - 1, 0)
+        k = first - lo
+        yield first, c, hi, alpha[k:], beta[k:], spread[k:], z[k:]
+
+
+def block_positions(z, entry_z, exit_z, stop_z, state, ends=None):
+    """
+    signal_positions over one block's rows [first, hi), continuing `state`
+    on row 0 (which is not traded). Returns (positions, state carried out).
+
+    ends: optional boolean array, True on the last bar of a session; each
+    session then starts flat and is forced flat on its last bar.
+    """
+    n = len(z)
+    if ends is None:
+        position = signal_positions(z, entry_z, exit_z, stop_z, initial_state=state)
+        return position, int(position[-1]) if n > 1 else state
+    starts = [0] + [i + 1 for i in np.flatnonzero(ends[:-1])]
+    position = np.zeros(n)
+    for k, lo in enumerate(starts):
+        hi = starts[k + 1] if k + 1 < len(starts) else n
+        position[lo:hi] = signal_positions(
+            z[lo:hi], entry_z, exit_z, stop_z, initial_state=state if k == 0 else 0,
+        )
+    # the first segment may be just row 0, which carries `state` unchanged
+    final = int(position[-1]) if n > 1 else state
+    position[ends] = 0.0
+    if ends[-1]:
+        final = 0
+    return position, final
+
+
+def block_backtest(position, beta, x, y, initial_capital, tc_bps, carry=None):
+    """
+    backtest_arrays over one block's rows [first, hi) of prices x / y.
+    carry: (equity, pos_Y, pos_X) on row 0 from the previous block (None for
+    the first block). Returns (pos_Y, pos_X, tc, equity, carry out).
+    """
+    ret_x = np.zeros(len(x))
+    ret_y = np.zeros(len(y))
+    ret_x[1:] = x[1:] / x[:-1] - 1
+    ret_y[1:] = y[1:] / y[:-1] - 1
+    pos_Y, pos_X, tc, equity = backtest_arrays(
+        position, beta, ret_x, ret_y,
+        initial_capital=initial_capital, tc_bps=tc_bps, start=carry,
+    )
+    return pos_Y, pos_X, tc, equity, (equity[-1], pos_Y[-1], pos_X[-1])
@@ -0,0 +1,156 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+from statsmodels.tsa.adfvalues import mackinnonp
+
+
+# p-values are linearly interpolated on this grid of test statistics. The
+# MacKinnon response surface is smooth, so the error stays below ~1e-6 except
+# within one grid step of the cutoff where statsmodels jumps to p = 1.
+_STAT_GRID = np.linspace(-20.0, 5.0, 12501)
+
+# same collinearity guard statsmodels' coint uses
+_SQRTEPS = np.sqrt(np.finfo(float).eps)
+
+
+@lru_cache(maxsize=None)
+def _pvalue_surface(regression: str, n_series: int) -> np.ndarray:
+    return np.array([mackinnonp(s, regression=regression, N=n_series) for s in _STAT_GRID])
+
+
+def mackinnon_pvalue(stat, regression: str = "c", n_series: int = 1):
+    """
+    Approximate MacKinnon (1994) p-value for an ADF / Engle–Granger statistic.
+    Works on scalars or arrays; the surface for each (regression, n_series)
+    is tabulated once and cached.
+    """
+    pvals = np.interp(stat, _STAT_GRID, _pvalue_surface(regression, n_series), left=0.0, right=1.0)
+    if np.ndim(pvals) == 0:
+        return float(pvals)
+    return pvals
+
+
+def _default_maxlag(nobs: int, ntrend: int) -> int:
+    # Schwert (1989) rule, capped like statsmodels' adfuller
+    maxlag = int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+    return min(nobs // 2 - ntrend - 1, maxlag)
+
+
+def _adf_design(x: np.ndarray, lags: int) -> Tuple[np.ndarray, np.ndarray]:
+    # rows: dx_t ~ x_{t-1} + dx_{t-1} + ... + dx_{t-lags}
+    xdiff = np.diff(x)
+    nobs = len(xdiff) - lags
+    design = np.empty((nobs, lags + 1))
+    design[:, 0] = x[-nobs - 1: -1]
+    for k in range(1, lags + 1):
+        design[:, k] = xdiff[lags - k: lags - k + nobs]
+    return design, xdiff[-nobs:]
+
+
+def _select_lag(x: np.ndarray, maxlag: int, constant: bool) -> int:
+    """
+    AIC lag search over 0..maxlag on a common sample. The candidate models are
+    nested, so one QR of the largest design gives every model's residual sum
+    of squares.
+    """
+    design, target = _adf_design(x, maxlag)
+    if constant:
+        design = np.column_stack([np.ones(len(target)), design])
+    nobs = len(target)
+
+    q, _ = np.linalg.qr(design)
+    qy = q.T @ target
+    ssr_full = float(np.sum((target - q @ qy) ** 2))
+    # ssr of the model with the first k columns = full ssr + tail of Q'y
+    tail = np.cumsum((qy ** 2)[::-1])[::-1]
+
+    start = 2 if constant else 1
+    best = None
+    for k in range(start, start + maxlag + 1):
+        ssr = ssr_full + (tail[k] if k < len(tail) else 0.0)
+        aic = nobs * np.log(ssr / nobs) + 2 * k
+        if best is None or aic < best[0]:
+            best = (aic, k)
+    return best[1] - start
+
+
+def _ols_tstat(design: np.ndarray, target: np.ndarray, col: int) -> float:
+    params, _, rank, _ = np.linalg.lstsq(design, target, rcond=None)
+    resid = target - design @ params
+    dof = len(target) - rank
+    sigma2 = float(resid @ resid) / dof
+    cov = sigma2 * np.linalg.pinv(design.T @ design)
+    return float(params[col] / np.sqrt(cov[col, col]))
+
+
+def adf_test(
+    x: np.ndarray,
+    regression: str = "c",
+    maxlag: Optional[int] = None,
+    autolag: Optional[str] = "aic",
+    n_series: int = 1,
+) -> Tuple[float, float, int]:
+    """
+    Lean augmented Dickey–Fuller test.
+
+    Mirrors statsmodels' adfuller for regression "c" / "n": Schwert maxlag,
+    AIC lag search on a common sample (autolag="aic"), then a refit at the
+    chosen lag. autolag=None uses `maxlag` lags directly. `n_series` selects
+    the MacKinnon surface (2 for an Engle–Granger residual).
+
+    returns
+    -------
+    (stat, pvalue, usedlag); (nan, nan, 0) for a constant series.
+    """
+    if regression not in ("c", "n"):
+        raise ValueError(f"Unsupported regression: {regression}")
+    x = np.asarray(x, dtype=float)
+    if x.max() == x.min():
+        return float("nan"), float("nan"), 0
+
+    constant = regression == "c"
+    if maxlag is None:
+        maxlag = _default_maxlag(len(x), int(constant))
+
+    usedlag = _select_lag(x, maxlag, constant) if autolag == "aic" else maxlag
+
+    design, target = _adf_design(x, usedlag)
+    if constant:
+        design = np.column_stack([design, np.ones(len(target))])
+    stat = _ols_tstat(design, target, 0)
+    p_regression = regression if n_series == 1 else "c"
+    return stat, mackinnon_pvalue(stat, p_regression, n_series), usedlag
+
+
+def engle_granger(
+    y: np.ndarray,
+    x: np.ndarray,
+    maxlag: Optional[int] = None,
+    autolag: Optional[str] = "aic",
+) -> Tuple[float, float, float, float, np.ndarray]:
+    """
+    Engle–Granger cointegration test of y on x with a constant.
+
+    The residual regression y ~ alpha + beta * x is solved once and its
+    residual is returned, so callers can reuse beta and run the spread ADF
+    without refitting.
+
+    returns
+    -------
+    (stat, pvalue, alpha, beta, resid)
+    """
+    y = np.asarray(y, dtype=float)
+    x = np.asarray(x, dtype=float)
+    design = np.column_stack([x, np.ones(len(x))])
+    (beta, alpha), _, _, _ = np.linalg.lstsq(design, y, rcond=None)
+    resid = y - (alpha + beta * x)
+
+    centered = y - y.mean()
+    rsquared = 1.0 - float(resid @ resid) / float(centered @ centered)
+    if rsquared >= 1 - 100 * _SQRTEPS:
+        # (almost) perfectly colinear, same edge case as statsmodels
+        return float("-inf"), 0.0, float(alpha), float(beta), resid
+
+    stat, pvalue, _ = adf_test(resid, regression="n", maxlag=maxlag, autolag=autolag, n_series=2)
+    return stat, pvalue, float(alpha), float(beta), resid
@@ -0,0 +1,189 @@
+"""
+Columnar build_spread -> generate_signals -> backtest_pair pipeline.
+
+The DataFrame path copies the frame at every stage and adds float64
+columns, so a long pair history is held many times over. Here all stages
+share one preallocated structured array (PAIR_DTYPE, one record per bar):
+each stage reads the fields of the previous one as views and writes its
+own fields in place, a block of `chunk_rows` rows at a time, so the only
+other memory is per-block scratch.
+
+Prices and equity stay float64; the derived columns are float32 and the
+position int8. Results match the DataFrame path up to float32 rounding of
+the stored columns (see run_pipeline).
+"""
+import numpy as np
+import pandas as pd
+
+from pairs_bot.blocks import block_backtest, block_bounds, block_positions, spread_blocks
+from pairs_bot.metrics import StreamingMetrics, infer_periods_per_year
+from pairs_bot.spread_model import KALMAN_DELTA, _kalman_init, _kalman_step
+
+PAIR_DTYPE = np.dtype([
+    ("X", "f8"),
+    ("Y", "f8"),
+    ("alpha", "f4"),
+    ("beta", "f4"),
+    ("spread", "f4"),
+    ("zscore", "f4"),
+    ("position", "i1"),
+    ("pos_Y", "f4"),
+    ("pos_X", "f4"),
+    ("tc", "f4"),
+    ("equity", "f8"),
+    ("returns", "f4"),
+])
+
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+
+def pair_store(df):
+    """
+    Store for an aligned pair frame (X / Y columns, align_pair): rows with a
+    missing price are dropped, every derived field starts as NaN / 0.
+    """
+    # column views, not a filtered copy of the frame, unless rows are missing
+    x = df["X"].to_numpy(dtype=float)
+    y = df["Y"].to_numpy(dtype=float)
+    index = df.index
+    missing = np.isnan(x) | np.isnan(y)
+    if missing.any():
+        x, y, index = x[~missing], y[~missing], index[~missing]
+    store = np.zeros(len(x), dtype=PAIR_DTYPE)
+    store["X"] = x
+    store["Y"] = y
+    for name in ("alpha", "beta", "spread", "zscore"):
+        store[name] = np.nan
+    return store, index
+
+
+def spread_stage(store, lookback=60, method="rolling", delta=KALMAN_DELTA, obs_var=None,
+                 chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    build_spread into the alpha / beta / spread / zscore fields.
+    method: "rolling" or "kalman" (as build_spread).
+    """
+    if method == "kalman":
+        return _kalman_spread_stage(store, lookback, delta, obs_var, chunk_rows)
+    if method != "rolling":
+        raise ValueError(f"Unknown hedge ratio method: {method}")
+    # same blocks and warm-up as intraday.backtest_pair_chunked
+    blocks = spread_blocks(store["X"], store["Y"], lookback, chunk_rows)
+    for first, c, hi, alpha, beta, spread, z in blocks:
+        k = c - first
+        store["alpha"][c:hi] = alpha[k:]
+        store["beta"][c:hi] = beta[k:]
+        store["spread"][c:hi] = spread[k:]
+        store["zscore"][c:hi] = z[k:]
+    return store
+
+
+def _kalman_spread_stage(store, lookback, delta, obs_var, chunk_rows):
+    # kalman_hedge_ratio with the filter state carried from block to block
+    if not len(store):
+        return store
+    warm = min(lookback, len(store))
+    state, ve = _kalman_init(store["Y"][:warm], store["X"][:warm])
+    ve = ve if obs_var is None else float(obs_var)
+    vw = delta / (1 - delta)
+    for c, hi in block_bounds(len(store), chunk_rows):
+        n = hi - c
+        alphas = [0.0] * n
+        betas = [0.0] * n
+        innov = [0.0] * n
+        var = [0.0] * n
+        for i, (xi, yi) in enumerate(zip(store["X"][c:hi].tolist(), store["Y"][c:hi].tolist())):
+            alphas[i] = state[0]
+            betas[i] = state[1]
+            state, innov[i], var[i] = _kalman_step(state, xi, yi, vw, ve)
+        z = np.asarray(innov) / np.sqrt(var)
+        z[:max(0, lookback - c)] = np.nan
+        store["alpha"][c:hi] = alphas
+        store["beta"][c:hi] = betas
+        store["spread"][c:hi] = innov
+        store["zscore"][c:hi] = z
+    return store
+
+
+def signal_stage(store, entry_z=2.0, exit_z=0.5, stop_z=4.0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    generate_signals from the zscore field into the position field.
+    """
+    state = 0
+    for c, hi in block_bounds(len(store), chunk_rows):
+        # row c - 1 carries the state in and is not traded again
+        first = max(c - 1, 0)
+        pos, state = block_positions(store["zscore"][first:hi], entry_z, exit_z, stop_z, state)
+        store["position"][c:hi] = pos[c - first:]
+    return store
+
+
+def backtest_stage(store, initial_capital=100000, tc_bps=2.0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    backtest_pair from the position / beta / price fields into pos_Y,
+    pos_X, tc, equity and returns.
+    """
+    carry = None
+    for c, hi in block_bounds(len(store), chunk_rows):
+        # row c - 1 carries equity and leg positions into this block
+        first = max(c - 1, 0)
+        pos_Y, pos_X, tc, equity, carry = block_backtest(
+            store["position"][first:hi], store["beta"][first:hi],
+            store["X"][first:hi], store["Y"][first:hi], initial_capital, tc_bps, carry,
+        )
+        skip = c - first
+        store["pos_Y"][c:hi] = pos_Y[skip:]
+        store["pos_X"][c:hi] = pos_X[skip:]
+        store["tc"][c:hi] = tc[skip:]
+        store["equity"][c:hi] = equity[skip:]
+        returns = np.zeros(len(equity))
+        returns[1:] = equity[1:] / equity[:-1] - 1
+        store["returns"][c:hi] = returns[skip:]
+    return store
+
+
+def run_pipeline(
+    df,
+    lookback=60,
+    entry_z=2.0,
+    exit_z=0.5,
+    stop_z=4.0,
+    initial_capital=100000,
+    tc_bps=2.0,
+    method="rolling",
+    chunk_rows=DEFAULT_CHUNK_ROWS,
+    periods_per_year=None,
+    **spread_kwargs,
+):
+    """
+    pair_store + spread_stage + signal_stage + backtest_stage: the columnar
+    equivalent of build_spread -> generate_signals -> backtest_pair.
+
+    Signals are taken from the stored float32 z-score and the backtest
+    sizes the hedge leg from the float32 beta, so positions match the
+    DataFrame path unless a z-score sits within float32 rounding of a
+    threshold, and equity matches to about 1e-6 relative.
+
+    returns {"store": structured array, "index": bar index, "stats": Dict}
+    """
+    store, index = pair_store(df)
+    spread_stage(store, lookback, method, chunk_rows=chunk_rows, **spread_kwargs)
+    signal_stage(store, entry_z, exit_z, stop_z, chunk_rows)
+    backtest_stage(store, initial_capital, tc_bps, chunk_rows)
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(index)
+    # scored block by block, so the metrics' scratch is per block as well
+    metrics = StreamingMetrics(1, trading_days=periods_per_year)
+    for c, hi in block_bounds(len(store), chunk_rows):
+        rows = store[c:hi]
+        metrics.update(rows["equity"][:, None], rows["position"][:, None], rows["tc"][:, None])
+    stats = {k: float(v[0]) for k, v in metrics.result().items()}
+    return {"store": store, "index": index, "stats": stats}
+
+
+def store_frame(store, index=None, fields=None):
+    """
+    DataFrame copy of (some of) the store's fields, for plotting or export.
+    """
+    fields = list(store.dtype.names if fields is None else fields)
+    return pd.DataFrame({f: store[f] for f in fields}, index=index)
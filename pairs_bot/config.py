@@ -28,10 +28,30 @@ UNIVERSE = [
 ]
 
 
+# sector tags for the groups above; cluster_candidates always tests pairs
+# that share a tag (sector ETFs are tagged with their constituents)
+SECTORS = {
+    **dict.fromkeys(["SPY", "IVV", "VOO", "IWM", "VTWO"], "broad_market"),
+    **dict.fromkeys(["QQQ", "VGT", "XLK", "SMH", "SOXX", "XLC",
+                     "AAPL", "MSFT", "NVDA", "AMD", "META", "GOOG", "GOOGL"], "tech"),
+    **dict.fromkeys(["XLE", "XOM", "CVX", "BP", "SHEL"], "energy"),
+    **dict.fromkeys(["XLF", "JPM", "BAC", "GS", "MS", "WFC", "C"], "banks"),
+    **dict.fromkeys(["V", "MA", "AXP"], "payments"),
+    **dict.fromkeys(["EEM", "VWO", "EFA", "IEFA"], "international"),
+    "XLP": "staples", "XLV": "health_care", "XLI": "industrials", "XLY": "discretionary",
+}
+
+# on-disk price store used by download_prices; set to None to always hit yfinance
+PRICE_CACHE_DIR = ".price_cache"
+
+# per-pair scan statistics reused by main_find_pairs; None disables the cache
+SCAN_CACHE_DIR = ".scan_cache"
+
 START_DATE = "2022-01-01"
 END_DATE = "2025-11-26"
 
 LOOKBACK_SPREAD = 90
+SPREAD_MODEL = "rolling"  # "rolling" (window OLS) or "kalman" (see spread_model.build_spread)
 ENTRY_Z = 2.5
 EXIT_Z = 0.8
 STOP_Z = 4.0
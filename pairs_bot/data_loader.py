@@ -1,9 +1,21 @@
 import yfinance as yf
 import pandas as pd
 
+from pairs_bot.price_store import PriceStore
 
-def download_prices(tickers, start, end):
-    data = yf.download(tickers, start=start, end=end, auto_adjust=False)["Close"]
+
+def download_prices(tickers, start, end, cache_dir=None, source=None, interval="1d", on_update=None):
+    # with cache_dir set, prices come from the on-disk store and only ranges
+    # it has not seen yet are fetched from `source` (yfinance by default).
+    # interval is a yfinance bar size ("1d", "1h", "5m", "1m", ...)
+    # on_update(tickers) is called when the store gets new prices for tickers
+    if cache_dir is not None:
+        store = PriceStore(cache_dir, source=source, on_update=on_update)
+        data = store.get(tickers, start, end, interval=interval)
+    elif source is not None:
+        data = source.fetch(tickers, start, end, interval=interval)
+    else:
+        data = yf.download(tickers, start=start, end=end, interval=interval, auto_adjust=False)["Close"]
     return data.dropna(how="all") # keep rows where only one price is missing, we can forward fill
 
 
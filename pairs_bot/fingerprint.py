@@ -0,0 +1,30 @@
+"""
+Content hashes behind the on-disk caches (walk_forward.WalkForwardCache,
+scan_cache.ScanCache): a price frame's fingerprint and a key built from it
+and the parameters that produced a cached result.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def frame_fingerprint(prices: pd.DataFrame) -> str:
+    """
+    Content hash of a price frame (index, columns and values).
+    """
+    h = hashlib.sha1()
+    h.update(np.asarray(prices.index.asi8 if isinstance(prices.index, pd.DatetimeIndex)
+                        else prices.index.values).tobytes())
+    h.update(json.dumps([str(c) for c in prices.columns]).encode())
+    h.update(np.ascontiguousarray(prices.to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()
+
+
+def cache_key(*parts) -> str:
+    """
+    Hash of JSON-able parts (fingerprints, tickers, parameter dicts); values
+    JSON cannot encode are hashed by their str().
+    """
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
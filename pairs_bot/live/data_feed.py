@@ -1,14 +1,178 @@
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
 import alpaca_trade_api as tradeapi
 
+from pairs_bot.live.instrumentation import REGISTRY
+
 
 def get_last_price(api: tradeapi.REST, symbol: str) -> Optional[float]:
     """
     Fetch the latest trade price; returns None if unavailable.
     """
     try:
-        trade = api.get_latest_trade(symbol)
+        with REGISTRY.timer("quote_fetch_seconds"):
+            trade = api.get_latest_trade(symbol)
         return float(trade.price)
     except Exception:
+        REGISTRY.inc("quote_errors_total")
         return None
+
+
+def get_last_prices(api: tradeapi.REST, symbols: Iterable[str]) -> Dict[str, Optional[float]]:
+    """
+    Latest trade price for many symbols in one multi-symbol request; symbols
+    without a trade map to None. Falls back to one request per symbol if the
+    batched call fails.
+    """
+    symbols = sorted({s.upper() for s in symbols})
+    if not symbols:
+        return {}
+    try:
+        with REGISTRY.timer("quote_batch_fetch_seconds"):
+            trades = api.get_latest_trades(symbols)
+    except Exception:
+        REGISTRY.inc("quote_errors_total")
+        return {s: get_last_price(api, s) for s in symbols}
+    prices: Dict[str, Optional[float]] = {}
+    for s in symbols:
+        trade = trades.get(s)
+        prices[s] = float(trade.price) if trade is not None else None
+        if trade is None:
+            REGISTRY.inc("quote_missing_total")
+    return prices
+
+
+class QuoteCache:
+    """
+    Shared last-price cache with a per-symbol TTL.
+
+    Prices arrive either from REST (get_many() refreshes only stale symbols,
+    in one batched request) or are pushed by a trade stream / replay feed via
+    put(), so subscribed symbols stay fresh without touching REST on the
+    order path. Holds at most `max_symbols`, evicting the least recently
+    updated.
+
+    clock: seconds-returning callable; a ReplayQuoteFeed supplies its own.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 2.0,
+        max_symbols: int = 1024,
+        ttl_overrides: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_symbols = max_symbols
+        self.ttl_overrides = {s.upper(): t for s, t in (ttl_overrides or {}).items()}
+        self.clock = clock
+        self._quotes: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, symbol: str, price: float, ts: Optional[float] = None) -> None:
+        symbol = symbol.upper()
+        with self._lock:
+            self._quotes[symbol] = (float(price), self.clock() if ts is None else ts)
+            self._quotes.move_to_end(symbol)
+            while len(self._quotes) > self.max_symbols:
+                self._quotes.popitem(last=False)
+
+    def staleness(self, symbol: str) -> Optional[float]:
+        """
+        Seconds since `symbol` was last updated; None if never seen.
+        """
+        entry = self._quotes.get(symbol.upper())
+        return None if entry is None else self.clock() - entry[1]
+
+    def _fresh(self, symbol: str) -> bool:
+        age = self.staleness(symbol)
+        return age is not None and age <= self.ttl_overrides.get(symbol, self.ttl)
+
+    def get(self, symbol: str) -> Optional[float]:
+        """
+        Cached price if still within its TTL, else None.
+        """
+        symbol = symbol.upper()
+        return self._quotes[symbol][0] if self._fresh(symbol) else None
+
+    def get_many(self, api: tradeapi.REST, symbols: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Prices for `symbols`, fetching only the stale ones from REST.
+        """
+        symbols = {s.upper() for s in symbols}
+        stale = {s for s in symbols if not self._fresh(s)}
+        REGISTRY.inc("quote_cache_hits_total", len(symbols) - len(stale))
+        if stale:
+            REGISTRY.inc("quote_cache_misses_total", len(stale))
+            for sym, price in get_last_prices(api, stale).items():
+                if price is not None:
+                    self.put(sym, price)
+        return {s: self.get(s) for s in symbols}
+
+    def evict_expired(self) -> int:
+        """
+        Drop every expired entry; returns how many were dropped.
+        """
+        with self._lock:
+            expired = [s for s in self._quotes if not self._fresh(s)]
+            for s in expired:
+                del self._quotes[s]
+        return len(expired)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        symbol -> {"price", "age", "stale"} for everything cached.
+        """
+        return {
+            s: {"price": price, "age": self.clock() - ts, "stale": not self._fresh(s)}
+            for s, (price, ts) in list(self._quotes.items())
+        }
+
+    def attach_stream(self, stream, symbols: Iterable[str]) -> None:
+        """
+        Keep `symbols` fresh from an alpaca_trade_api.stream.Stream trade feed.
+        The caller still runs the stream (stream.run()).
+        """
+        async def on_trade(trade):
+            self.put(trade.symbol, trade.price)
+
+        stream.subscribe_trades(on_trade, *[s.upper() for s in symbols])
+
+
+class ReplayQuoteFeed:
+    """
+    Drives a QuoteCache from recorded ticks (timestamp seconds, symbol,
+    price) on a simulated clock, for tests and replays.
+    """
+
+    def __init__(self, ticks: Iterable[Tuple[float, str, float]]):
+        self.ticks = sorted(ticks, key=lambda t: t[0])
+        self.now = self.ticks[0][0] if self.ticks else 0.0
+        self._next = 0
+
+    def clock(self) -> float:
+        return self.now
+
+    def cache(self, **kwargs) -> QuoteCache:
+        """
+        QuoteCache running on this feed's clock.
+        """
+        return QuoteCache(clock=self.clock, **kwargs)
+
+    def advance_to(self, ts: float, cache: QuoteCache) -> int:
+        """
+        Move the clock to `ts`, pushing every tick up to it into `cache`.
+        Returns the number of ticks delivered.
+        """
+        delivered = 0
+        while self._next < len(self.ticks) and self.ticks[self._next][0] <= ts:
+            tick_ts, symbol, price = self.ticks[self._next]
+            self.now = tick_ts
+            cache.put(symbol, price, ts=tick_ts)
+            self._next += 1
+            delivered += 1
+        self.now = max(self.now, ts)
+        return delivered
@@ -1,55 +1,79 @@
 import math
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import alpaca_trade_api as tradeapi
 
-from pairs_bot.live.data_feed import get_last_price
-from pairs_bot.live.portfolio import current_position_map
+from pairs_bot.live.data_feed import QuoteCache, get_last_price, get_last_prices
+from pairs_bot.live.instrumentation import REGISTRY
+from pairs_bot.live.portfolio import current_position_map, open_order_map
 
 
-def submit_delta_order(api: tradeapi.REST, symbol: str, delta_qty: float):
+def submit_delta_order(
+    api: tradeapi.REST,
+    symbol: str,
+    delta_qty: float,
+    quote_price: Optional[float] = None,
+):
     """
     Submit a market order for the required delta quantity.
     Positive delta -> buy, negative delta -> sell.
+    quote_price: the price the order was sized from, for slippage metrics.
     """
     qty = int(abs(delta_qty))
     if qty == 0:
         return None
     side = "buy" if delta_qty > 0 else "sell"
-    return api.submit_order(
-        symbol=symbol,
-        qty=qty,
-        side=side,
-        type="market",
-        time_in_force="day",
-    )
+    with REGISTRY.timer("order_submit_seconds"):
+        order = api.submit_order(
+            symbol=symbol,
+            qty=qty,
+            side=side,
+            type="market",
+            time_in_force="day",
+        )
+    REGISTRY.order_submitted(order, quote_price)
+    return order
 
 
-def target_pair_position(
+def wait_for_fills(
     api: tradeapi.REST,
+    orders: List,
+    timeout: float = 30.0,
+    poll_interval: float = 0.25,
+) -> List:
+    """
+    Poll submitted orders until they reach a final status (or `timeout`),
+    recording fill latency and slippage. Returns the latest order objects.
+    """
+    final = {"filled", "canceled", "expired", "rejected"}
+    latest = {str(o.id): o for o in orders}
+    deadline = time.monotonic() + timeout
+    while True:
+        open_ids = [i for i, o in latest.items() if o.status not in final]
+        if not open_ids or time.monotonic() >= deadline:
+            break
+        time.sleep(poll_interval)
+        for order_id in open_ids:
+            order = api.get_order(order_id)
+            latest[order_id] = order
+            if order.status == "filled":
+                REGISTRY.order_filled(order)
+    return list(latest.values())
+
+
+def pair_target_quantities(
     y_symbol: str,
     x_symbol: str,
     beta: float,
     state: int,
     notional: float,
-    price_cache: Optional[Dict[str, float]] = None,
-) -> List:
+    prices: Dict[str, Optional[float]],
+) -> Dict[str, int]:
     """
-    Move the live account to the desired pair state.
-
-    state: -1 short spread (short Y / long X * beta)
-           0 flat
-           1 long spread (long Y / short X * beta)
-    notional: gross dollars to deploy across both legs (approximate).
+    Signed share targets for both legs of a pair in `state`, sized from
+    `prices` (symbol -> last price).
     """
-    y_symbol = y_symbol.upper()
-    x_symbol = x_symbol.upper()
-    prices = dict(price_cache or {})
-    if y_symbol not in prices:
-        prices[y_symbol] = get_last_price(api, y_symbol)
-    if x_symbol not in prices:
-        prices[x_symbol] = get_last_price(api, x_symbol)
-
     price_y = prices.get(y_symbol)
     price_x = prices.get(x_symbol)
     if price_y is None or price_x is None or price_y <= 0 or price_x <= 0:
@@ -66,17 +90,178 @@ def target_pair_position(
 
     desired_y = state * qty_y
     desired_x = -state * qty_x * (1 if beta >= 0 else -1)
+    return {y_symbol: desired_y, x_symbol: desired_x}
+
+
+def target_pair_position(
+    api: tradeapi.REST,
+    y_symbol: str,
+    x_symbol: str,
+    beta: float,
+    state: int,
+    notional: float,
+    price_cache: Optional[Dict[str, float]] = None,
+    quote_cache: Optional[QuoteCache] = None,
+    net_open_orders: bool = False,
+) -> List:
+    """
+    Move the live account to the desired pair state.
+
+    state: -1 short spread (short Y / long X * beta)
+           0 flat
+           1 long spread (long Y / short X * beta)
+    notional: gross dollars to deploy across both legs (approximate).
+    quote_cache: shared QuoteCache; symbols not in `price_cache` are read
+    from it (REST only for stale quotes) instead of one request each.
+    net_open_orders: count the unfilled part of open orders as already held,
+    so a venue that fills late is not sent the same delta again.
+    """
+    y_symbol = y_symbol.upper()
+    x_symbol = x_symbol.upper()
+    prices = dict(price_cache or {})
+    missing = {y_symbol, x_symbol} - set(prices)
+    if missing and quote_cache is not None:
+        prices.update(quote_cache.get_many(api, missing))
+    elif missing:
+        for sym in sorted(missing):
+            prices[sym] = get_last_price(api, sym)
+
+    desired = pair_target_quantities(y_symbol, x_symbol, beta, state, notional, prices)
 
     current = current_position_map(api)
-    curr_y = current.get(y_symbol, 0.0)
-    curr_x = current.get(x_symbol, 0.0)
+    if net_open_orders:
+        for sym, qty in open_order_map(api).items():
+            current[sym] = current.get(sym, 0.0) + qty
+    orders = []
+    for sym in (y_symbol, x_symbol):
+        order = submit_delta_order(api, sym, desired[sym] - current.get(sym, 0.0), prices[sym])
+        if order is not None:
+            orders.append(order)
+    return orders
+
+
+def basket_target_quantities(
+    symbols: Sequence[str],
+    betas: Sequence[float],
+    state: int,
+    notional: float,
+    prices: Dict[str, Optional[float]],
+) -> Dict[str, int]:
+    """
+    Signed share targets for an N-leg basket (build_basket_spread): the
+    first symbol is the Y leg, symbols[1:] are hedged with `betas` (one per
+    hedge leg). Each hedge leg gets notional / 2 * |beta| dollars, so with
+    one hedge leg this is pair_target_quantities.
+    """
+    if len(betas) != len(symbols) - 1:
+        raise ValueError("Need one beta per hedge leg")
+    for sym in symbols:
+        price = prices.get(sym)
+        if price is None or price <= 0:
+            raise ValueError(f"Missing/invalid price for {sym}")
+
+    y_symbol = symbols[0]
+    qty_y = math.floor(notional / 2.0 / prices[y_symbol])
+    if qty_y == 0:
+        raise ValueError(f"Notional too small for a single share of {y_symbol}")
+    desired = {y_symbol: state * qty_y}
+    for sym, beta in zip(symbols[1:], betas):
+        qty = math.floor(notional / 2.0 * abs(beta) / prices[sym])
+        if qty == 0:
+            raise ValueError(f"Notional too small for a single share of {sym}")
+        desired[sym] = -state * qty * (1 if beta >= 0 else -1)
+    return desired
+
+
+def target_basket_position(
+    api: tradeapi.REST,
+    symbols: Sequence[str],
+    betas: Sequence[float],
+    state: int,
+    notional: float,
+    price_cache: Optional[Dict[str, float]] = None,
+    quote_cache: Optional[QuoteCache] = None,
+) -> List:
+    """
+    target_pair_position for an N-leg basket: symbols[0] against
+    symbols[1:] with hedge ratios `betas`, e.g. the last beta_<ticker>
+    columns of build_basket_spread.
+    """
+    symbols = [s.upper() for s in symbols]
+    prices = dict(price_cache or {})
+    missing = set(symbols) - set(prices)
+    if missing and quote_cache is not None:
+        prices.update(quote_cache.get_many(api, missing))
+    elif missing:
+        for sym in sorted(missing):
+            prices[sym] = get_last_price(api, sym)
+
+    desired = basket_target_quantities(symbols, betas, state, notional, prices)
+
+    current = current_position_map(api)
+    orders = []
+    for sym in symbols:
+        order = submit_delta_order(api, sym, desired[sym] - current.get(sym, 0.0), prices[sym])
+        if order is not None:
+            orders.append(order)
+    return orders
+
+
+def aggregate_targets(targets: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """
+    Sum per-pair share targets into one signed target per symbol, so legs
+    shared by several pairs (e.g. XOM in XLE/XOM and XOM/CVX) net out.
+    """
+    net: Dict[str, int] = {}
+    for target in targets:
+        for sym, qty in target.items():
+            net[sym] = net.get(sym, 0) + qty
+    return net
+
+
+def net_order_deltas(
+    targets: Iterable[Dict[str, int]],
+    current: Dict[str, float],
+) -> Dict[str, float]:
+    """
+    One delta per symbol: the summed target across all pairs minus the
+    position in a single `current` snapshot. Zero deltas are dropped.
+    """
+    net = aggregate_targets(targets)
+    deltas = {sym: qty - current.get(sym, 0.0) for sym, qty in net.items()}
+    return {sym: d for sym, d in deltas.items() if int(abs(d)) != 0}
+
+
+def target_portfolio_positions(
+    api: tradeapi.REST,
+    pairs: Sequence[Tuple[str, str, float, int, float]],
+    price_cache: Optional[Dict[str, float]] = None,
+    quote_cache: Optional[QuoteCache] = None,
+) -> List:
+    """
+    Move the account to the combined target of many pairs at once.
+
+    pairs: (y_symbol, x_symbol, beta, state, notional) per pair. Targets are
+    summed per symbol and netted against one positions snapshot, so each
+    symbol gets at most one order no matter how many pairs trade it.
+    quote_cache: as in target_pair_position.
+    """
+    pairs = [(y.upper(), x.upper(), beta, state, notional) for y, x, beta, state, notional in pairs]
+    prices = dict(price_cache or {})
+    missing = {s for y, x, *_ in pairs for s in (y, x)} - set(prices)
+    if missing:
+        fetch = quote_cache.get_many if quote_cache is not None else get_last_prices
+        prices.update(fetch(api, missing))
 
-    delta_y = desired_y - curr_y
-    delta_x = desired_x - curr_x
+    targets = [
+        pair_target_quantities(y, x, beta, state, notional, prices)
+        for y, x, beta, state, notional in pairs
+    ]
+    deltas = net_order_deltas(targets, current_position_map(api))
 
     orders = []
-    for sym, delta in [(y_symbol, delta_y), (x_symbol, delta_x)]:
-        order = submit_delta_order(api, sym, delta)
+    for sym, delta in sorted(deltas.items()):
+        order = submit_delta_order(api, sym, delta, prices.get(sym))
         if order is not None:
             orders.append(order)
     return orders
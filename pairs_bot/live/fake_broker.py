@@ -0,0 +1,233 @@
+"""
+In-memory stand-in for the subset of alpaca_trade_api.REST the live package
+uses, for tests and dry runs. Market orders fill immediately at the current
+price (less `slippage_bps`); `latency` adds a blocking sleep to every call so concurrency can be
+exercised.
+
+Limit orders rest until set_price() moves the market to or through their
+limit, then fill at the limit, at most `limit_fill_qty` shares per price
+update (partial fills). `impact_bps_per_lot` makes market orders pay extra
+per 100 shares, so slicing a large order is cheaper than sending it whole.
+"""
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class FakeTrade:
+    symbol: str
+    price: float
+
+
+@dataclass
+class FakePosition:
+    symbol: str
+    qty: str  # Alpaca returns quantities as strings
+
+
+@dataclass
+class FakeOrder:
+    id: str
+    symbol: str
+    qty: int
+    side: str
+    type: str
+    time_in_force: str
+    status: str = "new"
+    filled_qty: int = 0
+    filled_avg_price: Optional[float] = None
+    limit_price: Optional[float] = None
+
+
+@dataclass
+class FakeBroker:
+    prices: Dict[str, float] = field(default_factory=dict)
+    positions: Dict[str, float] = field(default_factory=dict)
+    latency: float = 0.0
+    slippage_bps: float = 0.0  # market orders fill this much through the price
+    impact_bps_per_lot: float = 0.0  # extra market-order slippage per 100 shares
+    limit_fill_qty: Optional[int] = None  # max shares a resting limit fills per update
+    orders: List[FakeOrder] = field(default_factory=list)
+    calls: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # id lookups and resting limits stay O(1) / O(open) however many
+        # orders a long replay accumulates
+        self._by_id: Dict[str, FakeOrder] = {o.id: o for o in self.orders}
+        self._resting: Dict[str, FakeOrder] = {}
+        self._open: Dict[str, FakeOrder] = {o.id: o for o in self.orders if self._is_open(o)}
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def set_price(self, symbol: str, price: float) -> None:
+        symbol = symbol.upper()
+        self.prices[symbol] = float(price)
+        if not self._resting:
+            return
+        with self._lock:
+            resting = [o for o in self._resting.values() if o.symbol == symbol and self._is_open(o)]
+        for order in resting:
+            if self._crosses(order, price, touch=True):
+                self._fill_limit(order)
+
+    def get_latest_trade(self, symbol: str) -> FakeTrade:
+        self._call("get_latest_trade")
+        symbol = symbol.upper()
+        if symbol not in self.prices:
+            raise KeyError(f"No trades for {symbol}")
+        return FakeTrade(symbol, self.prices[symbol])
+
+    def get_latest_trades(self, symbols) -> Dict[str, FakeTrade]:
+        self._call("get_latest_trades")
+        return {
+            s.upper(): FakeTrade(s.upper(), self.prices[s.upper()])
+            for s in symbols
+            if s.upper() in self.prices
+        }
+
+    def list_positions(self) -> List[FakePosition]:
+        self._call("list_positions")
+        with self._lock:
+            return [FakePosition(s, str(q)) for s, q in self.positions.items() if q != 0]
+
+    def list_orders(self, status: str = "open", limit: Optional[int] = None, **kwargs) -> List[FakeOrder]:
+        self._call("list_orders")
+        with self._lock:
+            if status == "open":
+                orders = list(self._open.values())
+            elif status == "closed":
+                orders = [o for o in self.orders if not self._is_open(o)]
+            else:
+                orders = list(self.orders)
+        # newest first, as Alpaca returns them
+        return orders[::-1][:limit]
+
+    def _fill(self, order: FakeOrder, qty: int, price: float) -> None:
+        signed = qty if order.side == "buy" else -qty
+        with self._lock:
+            self.positions[order.symbol] = self.positions.get(order.symbol, 0) + signed
+            total = order.filled_qty + qty
+            prev = (order.filled_avg_price or 0.0) * order.filled_qty
+            order.filled_avg_price = (prev + price * qty) / total
+            order.filled_qty = total
+            order.status = "filled" if total >= order.qty else "partially_filled"
+            if order.status == "filled":
+                self._resting.pop(order.id, None)
+                self._open.pop(order.id, None)
+
+    @staticmethod
+    def _is_open(order: FakeOrder) -> bool:
+        return order.status in ("new", "partially_filled")
+
+    @staticmethod
+    def _crosses(order: FakeOrder, price: float, touch: bool) -> bool:
+        # on arrival a limit only fills if strictly marketable; once resting
+        # it fills when trades print at its limit
+        if order.side == "buy":
+            return price <= order.limit_price if touch else price < order.limit_price
+        return price >= order.limit_price if touch else price > order.limit_price
+
+    def _fill_limit(self, order: FakeOrder, price: Optional[float] = None) -> None:
+        qty = order.qty - order.filled_qty
+        if self.limit_fill_qty is not None:
+            qty = min(qty, self.limit_fill_qty)
+        if qty > 0:
+            self._fill(order, qty, order.limit_price if price is None else price)
+
+    def _find(self, order_id: str) -> FakeOrder:
+        order = self._by_id.get(str(order_id))
+        if order is None:
+            raise KeyError(f"Unknown order {order_id}")
+        return order
+
+    def get_order(self, order_id: str) -> FakeOrder:
+        self._call("get_order")
+        with self._lock:
+            return self._find(order_id)
+
+    def cancel_order(self, order_id: str) -> None:
+        self._call("cancel_order")
+        with self._lock:
+            order = self._find(order_id)
+            if self._is_open(order):
+                order.status = "canceled"
+            self._resting.pop(order.id, None)
+            self._open.pop(order.id, None)
+
+    def replace_order(
+        self,
+        order_id: str,
+        qty=None,
+        limit_price: Optional[float] = None,
+        **kwargs,
+    ) -> FakeOrder:
+        """
+        Alpaca semantics: the open order is closed as "replaced" (keeping what
+        it already filled) and a new order for `qty` takes its place.
+        """
+        self._call("replace_order")
+        with self._lock:
+            old = self._find(order_id)
+            if not self._is_open(old):
+                raise ValueError(f"Order {order_id} is {old.status}, cannot replace")
+            old.status = "replaced"
+            self._resting.pop(old.id, None)
+            self._open.pop(old.id, None)
+        return self._new_order(
+            old.symbol,
+            qty if qty is not None else old.qty - old.filled_qty,
+            old.side,
+            old.type,
+            old.time_in_force,
+            limit_price if limit_price is not None else old.limit_price,
+        )
+
+    def submit_order(
+        self,
+        symbol: str,
+        qty,
+        side: str,
+        type: str = "market",
+        time_in_force: str = "day",
+        limit_price: Optional[float] = None,
+        **kwargs,
+    ) -> FakeOrder:
+        self._call("submit_order")
+        return self._new_order(symbol, qty, side, type, time_in_force, limit_price)
+
+    def _new_order(self, symbol, qty, side, type, time_in_force, limit_price) -> FakeOrder:
+        order = FakeOrder(
+            id=str(next(self._ids)),
+            symbol=symbol.upper(),
+            qty=int(qty),
+            side=side,
+            type=type,
+            time_in_force=time_in_force,
+            limit_price=None if limit_price is None else float(limit_price),
+        )
+        with self._lock:
+            self.orders.append(order)
+            self._by_id[order.id] = order
+            self._open[order.id] = order
+            if type == "limit":
+                self._resting[order.id] = order
+        price = self.prices[order.symbol]
+        if type == "market":
+            self._fill_market(order)
+        elif type == "limit" and self._crosses(order, price, touch=False):
+            self._fill_limit(order, price)
+        return order
+
+    def _fill_market(self, order: FakeOrder) -> None:
+        sign = 1.0 if order.side == "buy" else -1.0
+        bps = self.slippage_bps + self.impact_bps_per_lot * order.qty / 100
+        self._fill(order, order.qty, self.prices[order.symbol] * (1 + sign * bps / 10000))
@@ -0,0 +1,194 @@
+"""
+In-process latency / slippage metrics for the live order path.
+
+The module-level REGISTRY starts disabled; every hook then costs one
+attribute check. Turn it on with REGISTRY.enable() (or enable_metrics()) and
+read it back with to_json() / to_prometheus().
+"""
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLIPPAGE_BUCKETS_BPS = (-50.0, -20.0, -10.0, -5.0, -2.0, -1.0, 0.0, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus style: cumulative on export).
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        out = []
+        for le, c in zip(self.buckets + (float("inf"),), self.counts):
+            total += c
+            out.append((le, total))
+        return out
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = False, prefix: str = "pairs_bot"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        # order id -> (submit time, side, quote used for sizing)
+        self._pending: Dict[str, Tuple[float, str, Optional[float]]] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self._pending.clear()
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram(buckets)
+            hist.observe(value)
+
+    def inc(self, name: str, amount: float = 1.0) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0.0) + amount
+
+    def timer(self, name: str):
+        """
+        Context manager recording the wall time of its block in `name`.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name)
+
+    @contextmanager
+    def _timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def order_submitted(self, order, quote_price: Optional[float] = None) -> None:
+        """
+        Remember when `order` went out and the quote it was sized from; if the
+        broker already reports it filled, record the fill right away.
+        """
+        if not self.enabled or order is None:
+            return
+        with self._lock:
+            self._pending[str(order.id)] = (time.perf_counter(), order.side, quote_price)
+        if getattr(order, "status", None) == "filled":
+            self.order_filled(order)
+
+    def order_filled(self, order) -> None:
+        """
+        Record submit -> fill latency and fill-vs-quote slippage (bps, positive
+        = paid up) for an order seen as filled.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            pending = self._pending.pop(str(order.id), None)
+        if pending is None:
+            return
+        submitted, side, quote = pending
+        self.observe("order_fill_seconds", time.perf_counter() - submitted)
+        fill = getattr(order, "filled_avg_price", None)
+        if quote and fill is not None:
+            sign = 1.0 if side == "buy" else -1.0
+            self.observe(
+                "fill_slippage_bps",
+                sign * (float(fill) - quote) / quote * 10000,
+                buckets=SLIPPAGE_BUCKETS_BPS,
+            )
+
+    def order_closed(self, order) -> None:
+        """
+        Forget an order that was canceled or replaced before filling.
+        """
+        if not self.enabled or order is None:
+            return
+        with self._lock:
+            self._pending.pop(str(order.id), None)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: {
+                        "count": h.count,
+                        "sum": h.sum,
+                        "buckets": {str(le): c for le, c in h.cumulative()},
+                    }
+                    for name, h in self.histograms.items()
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, h in sorted(self.histograms.items()):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for le, c in h.cumulative():
+                    label = "+Inf" if le == float("inf") else repr(le)
+                    lines.append(f'{metric}_bucket{{le="{label}"}} {c}')
+                lines.append(f"{metric}_sum {h.sum}")
+                lines.append(f"{metric}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def enable_metrics() -> MetricsRegistry:
+    REGISTRY.enable()
+    return REGISTRY
@@ -2,16 +2,36 @@ from typing import Dict
 
 import alpaca_trade_api as tradeapi
 
+from pairs_bot.live.instrumentation import REGISTRY
+
 
 def current_position_map(api: tradeapi.REST) -> Dict[str, float]:
     """
     Map of symbol -> signed quantity for all open positions.
     """
     positions: Dict[str, float] = {}
-    for pos in api.list_positions():
+    with REGISTRY.timer("position_fetch_seconds"):
+        raw = api.list_positions()
+    for pos in raw:
         try:
             qty = float(pos.qty)
         except Exception:
             qty = 0.0
         positions[pos.symbol.upper()] = qty
     return positions
+
+
+def open_order_map(api: tradeapi.REST) -> Dict[str, float]:
+    """
+    Map of symbol -> signed quantity still working in open orders (sent but
+    not yet filled).
+    """
+    working: Dict[str, float] = {}
+    for order in api.list_orders(status="open", limit=500):
+        try:
+            qty = float(order.qty) - float(order.filled_qty or 0)
+        except Exception:
+            qty = 0.0
+        sym = order.symbol.upper()
+        working[sym] = working.get(sym, 0.0) + (qty if order.side == "buy" else -qty)
+    return working
@@ -0,0 +1,257 @@
+"""
+Offline replay of the live code path over historical bars.
+
+ReplayBroker is a FakeBroker whose prices come from a bar frame, one row per
+advance(), with cash accounting, commissions and a fill delay in bars. The
+live functions talk to it through the same REST surface they use against
+Alpaca (get_latest_trade, list_positions, submit_order), so replay_pair()
+runs the unchanged PairSignalEngine + target_pair_position loop bar by bar
+and compares the result with backtest_pair on the same bars.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pairs_bot.backtest import backtest_pair
+from pairs_bot.live.execution import target_pair_position
+from pairs_bot.live.fake_broker import FakeBroker, FakeOrder
+from pairs_bot.live.signal_engine import PairSignalEngine
+from pairs_bot.signals import generate_signals
+from pairs_bot.spread_model import build_spread
+
+
+@dataclass
+class ReplayBroker(FakeBroker):
+    """
+    bars: close prices, one column per symbol, indexed by bar time.
+    cash: starting cash; every fill moves it, less `tc_bps` commission on
+    the traded notional.
+    latency_bars: market orders fill at the close this many bars after
+    submission (0 = at the current close). Until then they are "new" and
+    not in list_positions(), as with a slow venue; one cancelled in the
+    meantime never fills.
+
+    Starts on row 0; advance() steps to the next row.
+    """
+
+    bars: Optional[pd.DataFrame] = None
+    cash: float = 0.0
+    tc_bps: float = 0.0
+    latency_bars: int = 0
+    commissions: float = 0.0
+    shares_traded: int = 0
+    notional_traded: float = 0.0
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.bars is None or self.bars.empty:
+            raise ValueError("ReplayBroker needs a non-empty bars frame")
+        self.symbols = [str(c).upper() for c in self.bars.columns]
+        self._closes = self.bars.to_numpy(dtype=float)
+        # (due bar, order), in due order since latency is fixed
+        self._pending: Deque[Tuple[int, FakeOrder]] = deque()
+        self.cursor = 0
+        self._set_row(0)
+
+    @property
+    def now(self) -> pd.Timestamp:
+        return self.bars.index[self.cursor]
+
+    def _set_row(self, i: int) -> None:
+        for sym, price in zip(self.symbols, self._closes[i].tolist()):
+            if price == price:  # skip NaN: keep the last close
+                self.set_price(sym, price)
+
+    def advance(self) -> bool:
+        """
+        Move to the next bar and fill the orders due on it. Returns False
+        (without moving) once the last bar has been reached.
+        """
+        if self.cursor + 1 >= len(self._closes):
+            return False
+        self.cursor += 1
+        self._set_row(self.cursor)
+        while self._pending and self._pending[0][0] <= self.cursor:
+            _, order = self._pending.popleft()
+            if self._is_open(order):  # cancelled in flight: never fills
+                super()._fill_market(order)
+        return True
+
+    def _fill_market(self, order: FakeOrder) -> None:
+        if self.latency_bars > 0:
+            self._pending.append((self.cursor + self.latency_bars, order))
+        else:
+            super()._fill_market(order)
+
+    def _fill(self, order: FakeOrder, qty: int, price: float) -> None:
+        super()._fill(order, qty, price)
+        signed = qty if order.side == "buy" else -qty
+        traded = qty * price
+        commission = traded * self.tc_bps / 10000
+        self.cash -= signed * price + commission
+        self.commissions += commission
+        self.shares_traded += qty
+        self.notional_traded += traded
+
+    def equity(self) -> float:
+        """
+        Cash plus positions marked at the current closes.
+        """
+        return self.cash + sum(q * self.prices[s] for s, q in self.positions.items() if q)
+
+
+def replay_pair(
+    bars: pd.DataFrame,
+    y_symbol: str,
+    x_symbol: str,
+    notional: float,
+    lookback: int = 60,
+    entry_z: float = 2.0,
+    exit_z: float = 0.5,
+    stop_z: float = 4.0,
+    tc_bps: float = 2.0,
+    slippage_bps: float = 0.0,
+    latency_bars: int = 0,
+    cash: Optional[float] = None,
+    **engine_kwargs,
+) -> Dict:
+    """
+    Run the live loop for one pair over `bars` (close prices with y_symbol
+    and x_symbol columns): each bar, PairSignalEngine.update on the closes,
+    then target_pair_position against a ReplayBroker.
+
+    The engine starts cold on row 0, so it warms up over the first
+    `lookback` bars like build_spread does. Orders still in flight (with
+    latency_bars > 0) are netted into each bar's delta, so a late fill is
+    never sent twice. Sizing failures (e.g. notional too small for one
+    share) are counted and the bar is skipped, as the live loop would log
+    and retry on the next one.
+
+    cash: starting cash, notional / 2 by default, which is the capital
+    backtest_pair is run with in the divergence report.
+
+    returns {"df": DataFrame(state, beta, zscore, equity, pos_<y>, pos_<x>),
+             "broker": ReplayBroker, "sizing_errors": int}
+    """
+    y_symbol = y_symbol.upper()
+    x_symbol = x_symbol.upper()
+    bars = bars[[y_symbol, x_symbol]].dropna()
+    broker = ReplayBroker(
+        bars=bars,
+        cash=notional / 2.0 if cash is None else float(cash),
+        tc_bps=tc_bps,
+        slippage_bps=slippage_bps,
+        latency_bars=latency_bars,
+    )
+    engine = PairSignalEngine(lookback, entry_z, exit_z, stop_z, **engine_kwargs)
+
+    n = len(bars)
+    states = np.zeros(n, dtype=np.int8)
+    betas = np.full(n, np.nan)
+    zscores = np.full(n, np.nan)
+    equity = np.empty(n)
+    pos_y = np.zeros(n)
+    pos_x = np.zeros(n)
+    sizing_errors = 0
+    for i in range(n):
+        if i > 0:
+            broker.advance()
+        state = engine.update(broker.prices[x_symbol], broker.prices[y_symbol])
+        if engine.beta == engine.beta:
+            try:
+                # open orders count as held: with latency_bars > 0 the delta
+                # already in flight must not be sent again every bar
+                target_pair_position(
+                    broker, y_symbol, x_symbol, engine.beta, state, notional, net_open_orders=True,
+                )
+            except ValueError:
+                sizing_errors += 1
+        states[i] = state
+        betas[i] = engine.beta
+        zscores[i] = engine.zscore
+        equity[i] = broker.equity()
+        pos_y[i] = broker.positions.get(y_symbol, 0)
+        pos_x[i] = broker.positions.get(x_symbol, 0)
+
+    out = pd.DataFrame(
+        {
+            "state": states, "beta": betas, "zscore": zscores, "equity": equity,
+            f"pos_{y_symbol}": pos_y, f"pos_{x_symbol}": pos_x,
+        },
+        index=bars.index,
+    )
+    return {"df": out, "broker": broker, "sizing_errors": sizing_errors}
+
+
+def divergence_report(
+    bars: pd.DataFrame,
+    y_symbol: str,
+    x_symbol: str,
+    notional: float,
+    lookback: int = 60,
+    entry_z: float = 2.0,
+    exit_z: float = 0.5,
+    stop_z: float = 4.0,
+    tc_bps: float = 2.0,
+    **replay_kwargs,
+) -> Dict:
+    """
+    replay_pair vs build_spread -> generate_signals -> backtest_pair on the
+    same bars. The backtest runs with initial_capital = notional / 2, which
+    is what target_pair_position puts on the Y leg, and the replay starts
+    with the same cash; both are compared in dollars of P&L on the rows the
+    backtest covers.
+
+    Differences come from integer share sizing, rebalancing only when the
+    share target changes (the backtest rebalances to equity * beta every
+    bar), slippage and fill latency, and commissions charged on fills.
+
+    returns {"replay": replay_pair result, "backtest": backtest_pair result,
+             "summary": Dict}
+    """
+    y_symbol = y_symbol.upper()
+    x_symbol = x_symbol.upper()
+    capital = notional / 2.0
+    replay = replay_pair(
+        bars, y_symbol, x_symbol, notional, lookback, entry_z, exit_z, stop_z,
+        tc_bps=tc_bps, cash=capital, **replay_kwargs,
+    )
+    # same column roles as align_pair, on the replayed rows
+    pair = replay["broker"].bars.rename(columns={x_symbol: "X", y_symbol: "Y"})[["X", "Y"]]
+    spread_kwargs = {k: replay_kwargs[k] for k in ("delta", "obs_var") if k in replay_kwargs}
+    spread = build_spread(pair, lookback, method=replay_kwargs.get("model", "rolling"), **spread_kwargs)
+    signals = generate_signals(spread, entry_z, exit_z, stop_z)
+    backtest = backtest_pair(signals, initial_capital=capital, tc_bps=tc_bps)
+
+    bt = backtest["df"]
+    live = replay["df"].loc[bt.index]
+    pnl_bt = bt["equity"].to_numpy() - capital
+    pnl_live = live["equity"].to_numpy() - capital
+    step_bt = np.diff(pnl_bt)
+    step_live = np.diff(pnl_live)
+    diff = step_live - step_bt
+    broker = replay["broker"]
+    summary = {
+        "bars": len(bt),
+        "state_mismatches": int((live["state"].to_numpy() != bt["position"].to_numpy()).sum()),
+        "pnl_live": float(pnl_live[-1]),
+        "pnl_backtest": float(pnl_bt[-1]),
+        "pnl_difference": float(pnl_live[-1] - pnl_bt[-1]),
+        "return_difference": float((pnl_live[-1] - pnl_bt[-1]) / capital),
+        "step_pnl_correlation": (
+            float(np.corrcoef(step_live, step_bt)[0, 1])
+            if len(diff) > 1 and step_live.std() > 0 and step_bt.std() > 0 else float("nan")
+        ),
+        "tracking_error": float(diff.std() / capital) if len(diff) else 0.0,
+        "max_abs_gap": float(np.abs(pnl_live - pnl_bt).max()),
+        "commissions_live": broker.commissions,
+        "costs_backtest": float(-bt["tc"].sum()),
+        "orders": len(broker.orders),
+        "shares_traded": broker.shares_traded,
+        "notional_traded": broker.notional_traded,
+        "sizing_errors": replay["sizing_errors"],
+    }
+    return {"replay": replay, "backtest": backtest, "summary": summary}
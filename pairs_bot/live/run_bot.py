@@ -3,34 +3,89 @@ Minimal entrypoint to move a pair position on Alpaca.
 
 Example usage (paper):
     python -m pairs_bot.live.run_bot --y XLE --x XOM --beta 1.2 --state 1 --notional 10000
+
+Without --beta/--state, both come from a PairSignalEngine warmed up on cached
+daily history for the pair:
+    python -m pairs_bot.live.run_bot --y XOM --x XLE --notional 10000
 """
 import argparse
 
+import pandas as pd
+
+from pairs_bot.config import (
+    LOOKBACK_SPREAD, ENTRY_Z, EXIT_Z, STOP_Z, PRICE_CACHE_DIR, SPREAD_MODEL,
+)
+from pairs_bot.data_loader import download_prices, align_pair
 from pairs_bot.live.live_config import get_client
 from pairs_bot.live.execution import target_pair_position
+from pairs_bot.live.signal_engine import PairSignalEngine
 
 
 def parse_args():
     p = argparse.ArgumentParser(description="Execute a pairs position on Alpaca.")
     p.add_argument("--y", required=True, help="Y leg symbol (goes long when state=1)")
     p.add_argument("--x", required=True, help="X leg symbol (hedge leg)")
-    p.add_argument("--beta", type=float, required=True, help="Hedge ratio beta (Y ~ beta*X)")
-    p.add_argument("--state", type=int, choices=[-1, 0, 1], required=True,
-                   help="-1 short spread, 0 flat, 1 long spread")
+    p.add_argument("--beta", type=float, default=None,
+                   help="Hedge ratio beta (Y ~ beta*X); from the signal engine if omitted")
+    p.add_argument("--state", type=int, choices=[-1, 0, 1], default=None,
+                   help="-1 short spread, 0 flat, 1 long spread; from the signal engine if omitted")
     p.add_argument("--notional", type=float, required=True,
                    help="Gross dollars to deploy across both legs.")
+    p.add_argument("--history-days", type=int, default=730,
+                   help="Calendar days of history to warm up the signal engine.")
+    p.add_argument("--lookback", type=int, default=LOOKBACK_SPREAD)
+    p.add_argument("--entry-z", type=float, default=ENTRY_Z)
+    p.add_argument("--exit-z", type=float, default=EXIT_Z)
+    p.add_argument("--stop-z", type=float, default=STOP_Z)
+    p.add_argument("--spread-model", choices=["rolling", "kalman"], default=SPREAD_MODEL)
     return p.parse_args()
 
 
+def engine_from_history(
+    x: str,
+    y: str,
+    history_days: int = 730,
+    lookback: int = LOOKBACK_SPREAD,
+    entry_z: float = ENTRY_Z,
+    exit_z: float = EXIT_Z,
+    stop_z: float = STOP_Z,
+    model: str = SPREAD_MODEL,
+) -> PairSignalEngine:
+    """
+    Signal engine warmed up on cached daily closes for the pair.
+    """
+    end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+    start = end - pd.Timedelta(days=history_days)
+    prices = download_prices([x, y], start, end, cache_dir=PRICE_CACHE_DIR)
+    return PairSignalEngine.from_history(
+        align_pair(prices, x, y),
+        lookback=lookback,
+        entry_z=entry_z,
+        exit_z=exit_z,
+        stop_z=stop_z,
+        model=model,
+    )
+
+
 def main():
     args = parse_args()
+    beta, state = args.beta, args.state
+    if beta is None or state is None:
+        engine = engine_from_history(
+            args.x, args.y, args.history_days,
+            args.lookback, args.entry_z, args.exit_z, args.stop_z, args.spread_model,
+        )
+        print(f"Signal engine: beta={engine.beta:.4f} z={engine.zscore:.2f} state={engine.state}")
+        beta = engine.beta if beta is None else beta
+        state = engine.state if state is None else state
+
     api = get_client()
     orders = target_pair_position(
         api=api,
         y_symbol=args.y,
         x_symbol=args.x,
-        beta=args.beta,
-        state=args.state,
+        beta=beta,
+        state=state,
         notional=args.notional,
     )
     if orders:
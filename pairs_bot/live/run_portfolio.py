@@ -0,0 +1,56 @@
+"""
+Keep many pairs at their signal-engine state on Alpaca from one process.
+
+Example usage (paper):
+    python -m pairs_bot.live.run_portfolio --pairs XOM:XLE,CVX:XOM,JPM:XLF --notional 10000 --cycles 1
+
+Pairs are given as Y:X. Every engine is warmed up on cached daily history;
+each cycle scores the latest quotes against it and rebalances, and the
+first cycle after each daily close adds that close as a new bar.
+"""
+import argparse
+import asyncio
+
+from pairs_bot.config import LOOKBACK_SPREAD, ENTRY_Z, EXIT_Z, STOP_Z, SPREAD_MODEL
+from pairs_bot.live.live_config import get_client
+from pairs_bot.live.run_bot import engine_from_history
+from pairs_bot.live.runner import LivePair, LiveRunner
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Run many pairs on Alpaca.")
+    p.add_argument("--pairs", required=True, help="Comma-separated Y:X pairs, e.g. XOM:XLE,CVX:XOM")
+    p.add_argument("--notional", type=float, required=True, help="Gross dollars per pair.")
+    p.add_argument("--cycles", type=int, default=None, help="Rebalances to run (default: forever).")
+    p.add_argument("--interval", type=float, default=60.0, help="Seconds between rebalances.")
+    p.add_argument("--max-concurrency", type=int, default=8, help="Orders in flight at once.")
+    p.add_argument("--history-days", type=int, default=730)
+    p.add_argument("--lookback", type=int, default=LOOKBACK_SPREAD)
+    p.add_argument("--entry-z", type=float, default=ENTRY_Z)
+    p.add_argument("--exit-z", type=float, default=EXIT_Z)
+    p.add_argument("--stop-z", type=float, default=STOP_Z)
+    p.add_argument("--spread-model", choices=["rolling", "kalman"], default=SPREAD_MODEL)
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    pairs = []
+    for spec in args.pairs.split(","):
+        y, x = spec.strip().split(":")
+        engine = engine_from_history(
+            x, y, args.history_days,
+            args.lookback, args.entry_z, args.exit_z, args.stop_z, args.spread_model,
+        )
+        pairs.append(LivePair(y=y, x=x, notional=args.notional, engine=engine))
+
+    runner = LiveRunner(
+        get_client(), pairs,
+        max_concurrency=args.max_concurrency,
+        interval=args.interval,
+    )
+    asyncio.run(runner.run(cycles=args.cycles))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import alpaca_trade_api as tradeapi
+import pandas as pd
+
+from pairs_bot.live.data_feed import QuoteCache, get_last_prices
+from pairs_bot.live.execution import net_order_deltas, pair_target_quantities, submit_delta_order
+from pairs_bot.live.portfolio import current_position_map
+from pairs_bot.live.signal_engine import PairSignalEngine
+
+
+@dataclass
+class LivePair:
+    y: str
+    x: str
+    notional: float
+    engine: PairSignalEngine
+    target: Optional[Dict[str, int]] = None  # last share targets sent
+    bar: Optional[pd.Timestamp] = None  # last bar committed to the engine
+
+    def __post_init__(self):
+        self.y = self.y.upper()
+        self.x = self.x.upper()
+
+
+def last_daily_close(now=None, close: str = "16:00", tz: str = "America/New_York") -> pd.Timestamp:
+    """
+    Date of the latest weekday close at or before `now`, as a naive
+    Timestamp. Exchange holidays are not known here: pass LiveRunner a
+    calendar-aware clock if that matters.
+    """
+    now = pd.Timestamp.now(tz=tz) if now is None else pd.Timestamp(now).tz_convert(tz)
+    day = now.normalize()
+    if day.weekday() >= 5 or now < day + pd.Timedelta(close + ":00"):
+        day -= pd.offsets.BDay(1)
+    return day.tz_localize(None)
+
+
+class LiveRunner:
+    """
+    Long-running loop that keeps many pairs at their signal-engine state over
+    one shared REST client.
+
+    Each cycle makes one batched quote request for every symbol, updates every
+    engine with those quotes, takes one positions snapshot, nets the pair
+    targets into one order per symbol, and submits those orders concurrently
+    (at most `max_concurrency` in flight). The blocking REST calls run in
+    worker threads so the event loop is never blocked. With a `quote_cache`
+    (e.g. fed by a trade stream) only stale symbols are requested.
+
+    Engines are warmed up on daily closes, so a quote is committed to an
+    engine (update) only on the first cycle after a new close of
+    `bar_clock` (label of the latest closed bar; last_daily_close by
+    default). The history is taken to cover the bar current at start. In
+    between, quotes are scored with engine.peek and sized with the
+    committed beta, so intraday cycles never enter the rolling windows.
+    """
+
+    def __init__(
+        self,
+        api: tradeapi.REST,
+        pairs: List[LivePair],
+        max_concurrency: int = 8,
+        interval: float = 60.0,
+        quote_cache: Optional[QuoteCache] = None,
+        bar_clock: Optional[Callable[[], pd.Timestamp]] = None,
+    ):
+        self.api = api
+        self.bar_clock = last_daily_close if bar_clock is None else bar_clock
+        self.quote_cache = quote_cache
+        self.pairs = pairs
+        self.interval = interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.symbols = sorted({s for p in pairs for s in (p.y, p.x)})
+
+    def _targets(self, prices: Dict[str, Optional[float]]) -> List[Dict[str, int]]:
+        targets = []
+        bar = self.bar_clock()
+        for p in self.pairs:
+            if p.bar is None:
+                p.bar = bar
+            price_x, price_y = prices.get(p.x), prices.get(p.y)
+            if price_x is None or price_y is None:
+                # no fresh quote: hold the last target so netting does not
+                # unwind this pair's share of a leg it has in common
+                if p.target is not None:
+                    targets.append(p.target)
+                continue
+            if bar != p.bar:
+                state = p.engine.update(price_x, price_y)
+                p.bar = bar
+            else:
+                state = p.engine.peek(price_x, price_y)
+            p.target = pair_target_quantities(p.y, p.x, p.engine.beta, state, p.notional, prices)
+            targets.append(p.target)
+        return targets
+
+    async def _submit(self, symbol: str, delta: float, quote: Optional[float]):
+        async with self._semaphore:
+            return await asyncio.to_thread(submit_delta_order, self.api, symbol, delta, quote)
+
+    async def run_cycle(self) -> List:
+        """
+        One rebalance: quotes -> engines -> positions -> orders.
+        Returns the submitted orders.
+        """
+        fetch = self.quote_cache.get_many if self.quote_cache is not None else get_last_prices
+        prices = await asyncio.to_thread(fetch, self.api, self.symbols)
+        targets = self._targets(prices)
+        current = await asyncio.to_thread(current_position_map, self.api)
+
+        # one netted order per symbol, even when several pairs share a leg
+        deltas = net_order_deltas(targets, current)
+        jobs = [self._submit(sym, delta, prices.get(sym)) for sym, delta in sorted(deltas.items())]
+        orders = await asyncio.gather(*jobs)
+        return [o for o in orders if o is not None]
+
+    async def run(self, cycles: Optional[int] = None) -> None:
+        """
+        Run `cycles` rebalances (forever if None), `interval` seconds apart.
+        """
+        done = 0
+        while cycles is None or done < cycles:
+            await self.run_cycle()
+            done += 1
+            if cycles is None or done < cycles:
+                await asyncio.sleep(self.interval)
@@ -0,0 +1,332 @@
+"""
+Child-order execution for pair deltas: TWAP slices or limit orders pegged to
+the quote, with a market fallback.
+
+A LeggedScheduler works every leg of a pair (or any set of symbols that must
+move together) one step() at a time, so the caller decides the pacing: run()
+sleeps `interval` seconds between steps against a live client, while
+simulate_schedule() steps once per bar of a recorded price path against a
+FakeBroker and compares the cost with one market order per leg.
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+import alpaca_trade_api as tradeapi
+
+from pairs_bot.live.data_feed import get_last_prices
+from pairs_bot.live.execution import pair_target_quantities
+from pairs_bot.live.fake_broker import FakeBroker
+from pairs_bot.live.instrumentation import REGISTRY
+from pairs_bot.live.portfolio import current_position_map
+
+_FINAL = {"filled", "canceled", "expired", "rejected", "replaced"}
+_ALGOS = {"twap", "peg"}
+
+
+@dataclass
+class _Leg:
+    symbol: str
+    target: int  # signed shares to trade
+    arrival: float  # quote when the schedule started
+    orders: Dict[str, object] = field(default_factory=dict)  # id -> latest order
+
+    @property
+    def side(self) -> str:
+        return "buy" if self.target > 0 else "sell"
+
+    @property
+    def filled(self) -> int:
+        return int(sum(float(o.filled_qty or 0) for o in self.orders.values()))
+
+    @property
+    def remaining(self) -> int:
+        return abs(self.target) - self.filled
+
+    @property
+    def working(self) -> int:
+        # sent but not yet filled, on children still open
+        return sum(int(float(o.qty)) - int(float(o.filled_qty or 0)) for o in self.open_orders())
+
+    @property
+    def progress(self) -> float:
+        return self.filled / abs(self.target)
+
+    def open_orders(self) -> List:
+        return [o for o in self.orders.values() if o.status not in _FINAL]
+
+    def avg_price(self) -> Optional[float]:
+        filled = self.filled
+        if filled == 0:
+            return None
+        return sum(
+            float(o.filled_avg_price) * float(o.filled_qty)
+            for o in self.orders.values() if float(o.filled_qty or 0) > 0
+        ) / filled
+
+
+class LeggedScheduler:
+    """
+    Work signed share deltas (symbol -> qty) as child orders over `slices`
+    steps.
+
+    algo="twap": each step sends a market child that brings every leg to
+    k / slices of its delta.
+    algo="peg":  each leg rests one limit order at the quote (`offset_bps`
+    on the passive side), re-pegged with replace_order when the quote moves.
+    At step `slices` resting limits are cancelled and the rest, less what
+    market children still have in flight, is sent at market.
+
+    No leg may run more than `max_lead` (fraction of its delta, default one
+    slice) ahead of the least filled leg; a leg that gets ahead has its
+    resting child cancelled or shrunk until the others catch up. Pair deltas
+    come from beta-sized targets (pair_target_quantities), so equal fill
+    fractions keep the partial position hedged by beta.
+    """
+
+    def __init__(
+        self,
+        api: tradeapi.REST,
+        deltas: Dict[str, float],
+        algo: str = "twap",
+        slices: int = 5,
+        max_lead: Optional[float] = None,
+        offset_bps: float = 0.0,
+        quote_fn: Callable = get_last_prices,
+        quotes: Optional[Dict[str, float]] = None,
+    ):
+        if algo not in _ALGOS:
+            raise ValueError(f"algo must be one of {sorted(_ALGOS)}, got {algo!r}")
+        if slices < 1:
+            raise ValueError("slices must be >= 1")
+        self.api = api
+        self.algo = algo
+        self.slices = slices
+        self.max_lead = 1.0 / slices if max_lead is None else max_lead
+        self.offset_bps = offset_bps
+        self.quote_fn = quote_fn
+        deltas = {s.upper(): int(d) for s, d in deltas.items() if int(d) != 0}
+        quotes = dict(quotes or {})
+        missing = set(deltas) - set(quotes)
+        if missing:
+            quotes.update(self.quote_fn(api, missing))
+        self.legs = [_Leg(s, d, quotes[s]) for s, d in sorted(deltas.items())]
+        self.steps = 0
+        self.max_imbalance = 0.0
+
+    @property
+    def done(self) -> bool:
+        # filled, with nothing left in flight that could still fill
+        return all(leg.remaining <= 0 and leg.working == 0 for leg in self.legs)
+
+    def _track(self, leg: _Leg, order, quote: Optional[float]) -> None:
+        leg.orders[str(order.id)] = order
+        REGISTRY.order_submitted(order, quote)
+
+    def _refresh(self) -> None:
+        for leg in self.legs:
+            for order in leg.open_orders():
+                latest = self.api.get_order(order.id)
+                leg.orders[str(order.id)] = latest
+                if latest.status == "filled":
+                    REGISTRY.order_filled(latest)
+                elif latest.status in _FINAL:
+                    REGISTRY.order_closed(latest)
+
+    def _cancel(self, leg: _Leg, limits_only: bool = False) -> None:
+        for order in leg.open_orders():
+            if limits_only and order.type != "limit":
+                continue
+            self.api.cancel_order(order.id)
+            latest = self.api.get_order(order.id)
+            leg.orders[str(order.id)] = latest
+            # the cancel may have raced a fill
+            if latest.status == "filled":
+                REGISTRY.order_filled(latest)
+            else:
+                REGISTRY.order_closed(latest)
+
+    def _market(self, leg: _Leg, qty: int, quote: Optional[float]) -> None:
+        if qty <= 0:
+            return
+        order = self.api.submit_order(
+            symbol=leg.symbol, qty=qty, side=leg.side, type="market", time_in_force="day",
+        )
+        self._track(leg, order, quote)
+
+    def _peg(self, leg: _Leg, qty: int, quote: float) -> None:
+        sign = 1.0 if leg.side == "buy" else -1.0
+        limit = round(quote * (1 - sign * self.offset_bps / 10000), 2)
+        resting = leg.open_orders()
+        if qty <= 0:
+            self._cancel(leg)
+            return
+        if not resting:
+            order = self.api.submit_order(
+                symbol=leg.symbol, qty=qty, side=leg.side, type="limit",
+                time_in_force="day", limit_price=limit,
+            )
+            self._track(leg, order, quote)
+            return
+        order = resting[0]
+        working = int(order.qty) - int(float(order.filled_qty or 0))
+        if float(order.limit_price) != limit or working != qty:
+            new = self.api.replace_order(order.id, qty=qty, limit_price=limit)
+            leg.orders[str(order.id)] = self.api.get_order(order.id)
+            REGISTRY.order_closed(order)
+            self._track(leg, new, quote)
+
+    def step(self) -> bool:
+        """
+        Advance the schedule by one slice. Returns True once every leg is filled.
+        """
+        if self.done:
+            return True
+        self.steps += 1
+        self._refresh()
+        quotes = self.quote_fn(self.api, [leg.symbol for leg in self.legs])
+        final = self.steps >= self.slices
+
+        if final:
+            # deadline: pull resting limits, take the rest at market. Market
+            # children still in flight are left to fill: a cancel can lose
+            # the race on a slow venue, and the resend would then overshoot
+            for leg in self.legs:
+                self._cancel(leg, limits_only=True)
+            for leg in self.legs:
+                self._market(leg, leg.remaining - leg.working, quotes.get(leg.symbol))
+        else:
+            floor = min(leg.progress for leg in self.legs)
+            goal = self.steps / self.slices if self.algo == "twap" else 1.0
+            for leg in self.legs:
+                frac = min(goal, floor + self.max_lead, 1.0)
+                qty = math.floor(frac * abs(leg.target) + 1e-9) - leg.filled
+                quote = quotes.get(leg.symbol)
+                if self.algo == "twap":
+                    # market children may still be in flight on a slow venue
+                    self._market(leg, qty - leg.working, quote)
+                elif quote is not None:
+                    self._peg(leg, qty, quote)
+
+        progress = [leg.progress for leg in self.legs]
+        self.max_imbalance = max(self.max_imbalance, max(progress) - min(progress))
+        return self.done
+
+    def run(self, interval: float = 10.0, max_steps: Optional[int] = None, sleep=time.sleep) -> Dict:
+        """
+        Step every `interval` seconds until filled (or `max_steps`), then
+        return report().
+        """
+        while not self.step():
+            if max_steps is not None and self.steps >= max_steps:
+                break
+            sleep(interval)
+        return self.report()
+
+    def report(self) -> Dict:
+        """
+        Realized cost against the arrival quotes.
+
+        slippage_bps is positive when the fills were worse than arrival;
+        cost is the same in dollars.
+        """
+        legs = {}
+        total_cost = 0.0
+        total_notional = 0.0
+        for leg in self.legs:
+            avg = leg.avg_price()
+            sign = 1.0 if leg.side == "buy" else -1.0
+            cost = 0.0 if avg is None else sign * (avg - leg.arrival) * leg.filled
+            notional = leg.arrival * leg.filled
+            legs[leg.symbol] = {
+                "target": leg.target,
+                "filled": leg.filled,
+                "arrival": leg.arrival,
+                "avg_price": avg,
+                "cost": cost,
+                "slippage_bps": cost / notional * 10000 if notional else 0.0,
+                "child_orders": len(leg.orders),
+            }
+            total_cost += cost
+            total_notional += notional
+        return {
+            "algo": self.algo,
+            "steps": self.steps,
+            "done": self.done,
+            "legs": legs,
+            "cost": total_cost,
+            "slippage_bps": total_cost / total_notional * 10000 if total_notional else 0.0,
+            "max_imbalance": self.max_imbalance,
+        }
+
+
+def schedule_pair_position(
+    api: tradeapi.REST,
+    y_symbol: str,
+    x_symbol: str,
+    beta: float,
+    state: int,
+    notional: float,
+    algo: str = "twap",
+    slices: int = 5,
+    interval: float = 10.0,
+    **kwargs,
+) -> Dict:
+    """
+    target_pair_position, worked as child orders by a LeggedScheduler
+    instead of one market order per leg. Returns the schedule report.
+    """
+    y_symbol = y_symbol.upper()
+    x_symbol = x_symbol.upper()
+    prices = get_last_prices(api, [y_symbol, x_symbol])
+    desired = pair_target_quantities(y_symbol, x_symbol, beta, state, notional, prices)
+    current = current_position_map(api)
+    deltas = {sym: desired[sym] - current.get(sym, 0.0) for sym in desired}
+    scheduler = LeggedScheduler(api, deltas, algo=algo, slices=slices, quotes=prices, **kwargs)
+    return scheduler.run(interval=interval)
+
+
+def simulate_schedule(
+    price_path: Iterable[Dict[str, float]],
+    deltas: Dict[str, float],
+    algo: str = "twap",
+    slices: int = 5,
+    broker_kwargs: Optional[Dict] = None,
+    **kwargs,
+) -> Dict:
+    """
+    Run a schedule against a FakeBroker that moves along `price_path` (one
+    {symbol: price} dict per step, e.g. df.to_dict("records")), and the
+    single-market-order baseline on a fresh broker from the same start.
+
+    returns {"schedule": report, "market": report, "improvement_bps": ...}
+    where improvement_bps > 0 means the schedule was cheaper.
+    """
+    path = list(price_path)
+    if not path:
+        raise ValueError("price_path is empty")
+    broker_kwargs = broker_kwargs or {}
+
+    market_broker = FakeBroker(prices=dict(path[0]), **broker_kwargs)
+    market = LeggedScheduler(market_broker, deltas, algo="twap", slices=1)
+    market.step()
+
+    broker = FakeBroker(prices=dict(path[0]), **broker_kwargs)
+    scheduler = LeggedScheduler(broker, deltas, algo=algo, slices=slices, **kwargs)
+    for t, prices in enumerate(path):
+        if t > 0:
+            for sym, price in prices.items():
+                broker.set_price(sym, price)
+        if scheduler.step():
+            break
+    while not scheduler.done and scheduler.steps < slices:
+        scheduler.step()
+
+    schedule_report = scheduler.report()
+    market_report = market.report()
+    return {
+        "schedule": schedule_report,
+        "market": market_report,
+        "improvement_bps": market_report["slippage_bps"] - schedule_report["slippage_bps"],
+    }
@@ -0,0 +1,255 @@
+import math
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from pairs_bot.spread_model import KALMAN_DELTA, KalmanHedgeRatio, _kalman_step, estimate_hedge_ratio
+
+
+class _RollingSums:
+    """
+    Running sums over a fixed-size window of rows, O(1) per push.
+
+    Values are stored relative to an anchor, and the sums are rebuilt from the
+    window every `size` pushes (amortized O(1)), so rounding error never
+    accumulates beyond one window.
+    """
+
+    def __init__(self, size: int, width: int):
+        self.size = size
+        self.rows: deque = deque()
+        self.anchor = np.zeros(width)
+        self.sums = np.zeros(width)
+        self.cross = np.zeros((width, width))
+        self._since_rebuild = 0
+
+    def push(self, row: np.ndarray) -> None:
+        self.rows.append(row)
+        c = row - self.anchor
+        self.sums += c
+        self.cross += np.outer(c, c)
+        if len(self.rows) > self.size:
+            old = self.rows.popleft() - self.anchor
+            self.sums -= old
+            self.cross -= np.outer(old, old)
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.size:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        window = np.array(self.rows)
+        self.anchor = window.mean(axis=0)
+        c = window - self.anchor
+        self.sums = c.sum(axis=0)
+        self.cross = c.T @ c
+        self._since_rebuild = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def moments(self):
+        """
+        (mean, centered cross-product matrix) of the current window.
+        """
+        n = len(self.rows)
+        m = self.sums / n
+        return self.anchor + m, self.cross - n * np.outer(m, m)
+
+    def moments_with(self, row: np.ndarray):
+        """
+        moments() as they would be after push(row), without pushing.
+        """
+        c = row - self.anchor
+        n = len(self.rows) + 1
+        sums = self.sums + c
+        cross = self.cross + np.outer(c, c)
+        if n > self.size:
+            old = self.rows[0] - self.anchor
+            sums = sums - old
+            cross = cross - np.outer(old, old)
+            n -= 1
+        m = sums / n
+        return self.anchor + m, cross - n * np.outer(m, m)
+
+
+class PairSignalEngine:
+    """
+    Streaming version of build_spread + generate_signals for one pair.
+
+    Each update(x, y) costs O(1): a rolling OLS of Y on X over the last
+    `lookback` bars from running sums, the spread y - (alpha + beta * x), its
+    z-score against the last `lookback` spreads, and the same entry / exit /
+    stop hysteresis. Fed the same bars, it returns the batch positions (up to
+    float rounding in the z-score; see replay()).
+
+    model="kalman" follows build_spread(method="kalman") instead: the first
+    `lookback` bars start a KalmanHedgeRatio, then every update is one filter
+    step and the z-score is the innovation over its std.
+    """
+
+    def __init__(
+        self,
+        lookback: int = 60,
+        entry_z: float = 2.0,
+        exit_z: float = 0.5,
+        stop_z: float = 4.0,
+        model: str = "rolling",
+        delta: float = KALMAN_DELTA,
+        obs_var: Optional[float] = None,
+    ):
+        if model not in ("rolling", "kalman"):
+            raise ValueError(f"Unknown spread model: {model}")
+        self.lookback = lookback
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.stop_z = stop_z
+        self.model = model
+        self.delta = delta
+        self.obs_var = obs_var
+        self._kalman: Optional[KalmanHedgeRatio] = None
+        self._warmup_bars: list = []
+        self._prices = _RollingSums(lookback, 2)
+        self._spreads = _RollingSums(lookback, 1)
+        self.n_bars = 0
+        self.alpha = float("nan")
+        self.beta = float("nan")
+        self.spread = float("nan")
+        self.zscore = float("nan")
+        self.state = 0
+
+    def _hedge_ratio(self, moments, n, rows):
+        # rows: callable giving the window, only needed for degenerate ones
+        (mx, my), cov = moments
+        vxx, vxy = cov[0, 0], cov[0, 1]
+        # same degenerate-window rule as spread_model.rolling_hedge_ratio
+        if n < 2 or not vxx > 1e-12 * (vxx + n * mx * mx):
+            window = np.array(rows())
+            return estimate_hedge_ratio(window[:, 1], window[:, 0])
+        beta = vxy / vxx
+        return my - beta * mx, beta
+
+    def _zscore(self, spread, moments, n) -> float:
+        if n < self.lookback:
+            return float("nan")
+        (mean,), var = moments
+        std = np.sqrt(max(var[0, 0], 0.0) / (self.lookback - 1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return float(np.float64(spread - mean) / std)
+
+    def _step_state(self, z: float) -> int:
+        state = self.state
+        if state == 0:
+            if z > self.entry_z:
+                return -1
+            if z < -self.entry_z:
+                return 1
+        elif state == 1:
+            if z > -self.exit_z or z < -self.stop_z:
+                return 0
+        elif state == -1:
+            if z < self.exit_z or z > self.stop_z:
+                return 0
+        return state
+
+    def _update_kalman(self, x: float, y: float) -> None:
+        if self._kalman is None:
+            self._warmup_bars.append((x, y))
+            if len(self._warmup_bars) < self.lookback:
+                return
+            # same start as kalman_hedge_ratio: OLS on the first `lookback`
+            # bars, then filter them; they get no z-score
+            xs, ys = zip(*self._warmup_bars)
+            self._kalman = KalmanHedgeRatio.from_history(ys, xs, self.delta, self.obs_var)
+            for xi, yi in self._warmup_bars:
+                self._kalman.update(xi, yi)
+            self._warmup_bars = []
+            self.alpha, self.beta = self._kalman.alpha, self._kalman.beta
+            return
+        self.alpha, self.beta, self.spread, q = self._kalman.update(x, y)
+        self.zscore = self.spread / math.sqrt(q)
+
+    def update(self, x: float, y: float) -> int:
+        """
+        Feed one bar (X and Y prices) and return the target state:
+        1 long spread, -1 short spread, 0 flat.
+        """
+        if self.model == "kalman":
+            self._update_kalman(float(x), float(y))
+        else:
+            self._prices.push(np.array([float(x), float(y)]))
+            self.alpha, self.beta = (float(v) for v in self._hedge_ratio(
+                self._prices.moments(), len(self._prices), lambda: self._prices.rows,
+            ))
+            self.spread = float(y) - (self.alpha + self.beta * float(x))
+            self._spreads.push(np.array([self.spread]))
+            self.zscore = self._zscore(self.spread, self._spreads.moments(), len(self._spreads))
+        # the batch loop never trades on the first bar
+        if self.n_bars > 0:
+            self.state = self._step_state(self.zscore)
+        self.n_bars += 1
+        return self.state
+
+    def peek(self, x: float, y: float) -> int:
+        """
+        The state update(x, y) would return, without committing the bar:
+        for scoring intraday quotes against an engine that takes one bar per
+        close. The windows / filter, alpha, beta and state are unchanged.
+        """
+        x, y = float(x), float(y)
+        if self.n_bars == 0:
+            return self.state
+        if self.model == "kalman":
+            if self._kalman is None:
+                return self.state
+            _, e, q = _kalman_step(self._kalman.state, x, y, self._kalman.vw, self._kalman.ve)
+            return self._step_state(e / math.sqrt(q))
+        row = np.array([x, y])
+        n = min(len(self._prices) + 1, self.lookback)
+        alpha, beta = self._hedge_ratio(
+            self._prices.moments_with(row), n,
+            lambda: list(self._prices.rows)[len(self._prices) + 1 - n:] + [row],
+        )
+        spread = y - (float(alpha) + float(beta) * x)
+        z = self._zscore(
+            spread, self._spreads.moments_with(np.array([spread])),
+            min(len(self._spreads) + 1, self.lookback),
+        )
+        return self._step_state(z)
+
+    def warmup(self, x, y) -> int:
+        """
+        Replay cached history (arrays or Series of X / Y prices) bar by bar and
+        return the resulting state.
+        """
+        for xi, yi in zip(np.asarray(x, dtype=float), np.asarray(y, dtype=float)):
+            self.update(xi, yi)
+        return self.state
+
+    def replay(self, x, y) -> np.ndarray:
+        """
+        Positions for every bar, to compare against
+        generate_signals(build_spread(df, lookback), ...)["position"].
+        """
+        return np.array([
+            self.update(xi, yi)
+            for xi, yi in zip(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        ], dtype=float)
+
+    @classmethod
+    def from_history(
+        cls,
+        df,
+        lookback: int = 60,
+        entry_z: float = 2.0,
+        exit_z: float = 0.5,
+        stop_z: float = 4.0,
+        **kwargs,
+    ) -> "PairSignalEngine":
+        """
+        Engine warmed up on an aligned pair frame with X / Y columns
+        (e.g. from data_loader.align_pair). kwargs: model / delta / obs_var.
+        """
+        engine = cls(lookback, entry_z, exit_z, stop_z, **kwargs)
+        engine.warmup(df["X"].values, df["Y"].values)
+        return engine
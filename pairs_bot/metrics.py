@@ -1,6 +1,48 @@
 import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+# bars in one regular US session (6.5 hours) per bar interval
+BARS_PER_SESSION = {
+    "1m": 390, "2m": 195, "5m": 78, "15m": 26, "30m": 13,
+    "60m": 6.5, "90m": 13 / 3, "1h": 6.5, "1d": 1,
+}
+
+
+def periods_per_year(interval="1d"):
+    """
+    Annualization factor for bars of `interval` (yfinance interval names).
+    """
+    if interval not in BARS_PER_SESSION:
+        raise ValueError(f"Unknown interval: {interval}")
+    return TRADING_DAYS * BARS_PER_SESSION[interval]
+
+
+def infer_periods_per_year(index, trading_days=TRADING_DAYS):
+    """
+    Annualization factor from a bar index: `trading_days` for daily (or
+    coarser, or non-datetime) indexes, otherwise `trading_days` times the
+    median number of bars per calendar day.
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return trading_days
+    if np.median(np.diff(index.asi8)) >= pd.Timedelta(days=1).value:
+        return trading_days
+    # bars per calendar day, from run lengths when the index is sorted (no
+    # per-row objects: this runs on multi-million-row minute indexes)
+    days = index.normalize().asi8
+    if index.is_monotonic_increasing:
+        edges = np.flatnonzero(days[1:] != days[:-1]) + 1
+        per_day = np.diff(np.concatenate(([0], edges, [len(days)])))
+    else:
+        per_day = np.unique(days, return_counts=True)[1]
+    return trading_days * float(np.median(per_day))
+
 
 def compute_performance_metrics(equity, returns, trading_days=252):
+    # trading_days is the number of bars per year: 252 for daily closes,
+    # periods_per_year("1m") / infer_periods_per_year(index) for intraday bars
     
     total_return = float(equity.iloc[-1] / equity.iloc[0] - 1)
     mean_ret = returns.mean()
@@ -19,4 +61,255 @@ def compute_performance_metrics(equity, returns, trading_days=252):
          "total_return": total_return,
         "sharpe": sharpe,
         "max_drawdown": max_dd 
-    }
\ No newline at end of file
+    }
+
+
+def _rows(a, width=None):
+    # scalar -> (1, 1), 1-D -> one row, 2-D unchanged
+    a = np.asarray(a, dtype=float)
+    if a.ndim == 0:
+        a = a.reshape(1, 1)
+    elif a.ndim == 1:
+        a = a.reshape(1, -1)
+    if width is not None and a.shape[1] != width:
+        a = np.broadcast_to(a, (a.shape[0], width))
+    return a
+
+
+def _ffill(block, first):
+    # block (T, S) with NaN gaps, first (S,) the value before row 0; returns
+    # the (T + 1, S) forward-filled stack [first, block]
+    stacked = np.vstack([first[None], block])
+    if not np.isnan(block).any():
+        return stacked
+    valid = ~np.isnan(stacked)
+    valid[0] = True
+    idx = np.where(valid, np.arange(len(stacked))[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return stacked[idx, np.arange(stacked.shape[1])]
+
+
+class StreamingMetrics:
+    """
+    Performance and trade statistics for many strategies at once, updated
+    block by block, so a backtest result and a live equity feed are scored
+    by the same code.
+
+    update(equity, position=None, tc=None) takes the next rows of a
+    (time x strategy) block: a 2-D array, one row as a 1-D array, or a
+    scalar for a single strategy. NaN equity means "no bar" for that
+    strategy (e.g. the trailing rows of backtest_block output). Only O(1)
+    state per strategy is kept between updates, and result() is the same
+    whether the history arrives in one block or one row at a time.
+
+    Conventions match compute_performance_metrics: the first bar counts as
+    a zero return, and the Sharpe / Sortino use `trading_days` bars per
+    year. position is the signal state (backtest "position" column); a
+    trade runs from a bar where it becomes non-zero to the bar where it
+    changes again, and its P&L is the equity change between those bars.
+    tc is the backtest "tc" column (costs as negative dollars).
+    """
+
+    def __init__(self, n_strategies, trading_days=TRADING_DAYS):
+        s = int(n_strategies)
+        self.n_strategies = s
+        self.trading_days = trading_days
+        self.count = np.zeros(s)
+        self.mean = np.zeros(s)
+        self.m2 = np.zeros(s)
+        self.down2 = np.zeros(s)
+        self.first = np.full(s, np.nan)
+        self.last = np.full(s, np.nan)
+        self.peak = np.full(s, -np.inf)
+        self.max_dd = np.zeros(s)
+        self.peak_bar = np.zeros(s)
+        self.max_dd_bars = np.zeros(s)
+        self.position = np.zeros(s)
+        self.abs_change = np.zeros(s)
+        self.total_tc = np.zeros(s)
+        self.open_bar = np.full(s, np.nan)
+        self.open_equity = np.full(s, np.nan)
+        self.n_trades = np.zeros(s)
+        self.n_wins = np.zeros(s)
+        self.hold_bars = np.zeros(s)
+
+    def update(self, equity, position=None, tc=None):
+        eq = _rows(equity, self.n_strategies)
+        if eq.shape[1] != self.n_strategies:
+            raise ValueError(f"Expected {self.n_strategies} strategies, got {eq.shape[1]}")
+        valid = ~np.isnan(eq)
+        n_new = valid.sum(axis=0)
+        cols = np.arange(self.n_strategies)
+
+        # returns against the last valid equity; the first bar ever is 0
+        prev = _ffill(eq, self.last)
+        ret = np.where(valid, eq / prev[:-1] - 1, 0.0)
+        ret[valid & np.isnan(prev[:-1])] = 0.0
+        first_row = np.argmax(valid, axis=0)
+        starting = np.isnan(self.first) & (n_new > 0)
+        self.first[starting] = eq[first_row[starting], cols[starting]]
+        self.last = prev[-1]
+
+        # Welford merge of this block's mean / M2 into the running ones
+        safe_n = np.maximum(n_new, 1)
+        block_mean = ret.sum(axis=0) / safe_n
+        block_m2 = (np.where(valid, ret - block_mean, 0.0) ** 2).sum(axis=0)
+        total = self.count + n_new
+        delta = block_mean - self.mean
+        share = np.where(total > 0, n_new / np.maximum(total, 1), 0.0)
+        self.m2 = self.m2 + block_m2 + delta * delta * self.count * share
+        self.mean = self.mean + delta * share
+        self.down2 += (np.minimum(ret, 0.0) ** 2).sum(axis=0)
+
+        # drawdown depth and duration, counted in valid bars
+        bar = self.count + np.cumsum(valid, axis=0)
+        peak = np.maximum.accumulate(
+            np.vstack([self.peak[None], np.where(valid, eq, -np.inf)]), axis=0,
+        )[1:]
+        drawdown = np.where(valid, eq / peak - 1, 0.0)
+        at_peak = valid & (eq >= peak)
+        peak_bar = np.maximum.accumulate(
+            np.vstack([self.peak_bar[None], np.where(at_peak, bar, 0)]), axis=0,
+        )[1:]
+        if len(eq):
+            self.max_dd = np.minimum(self.max_dd, drawdown.min(axis=0))
+            self.max_dd_bars = np.maximum(
+                self.max_dd_bars, np.where(valid, bar - peak_bar, 0).max(axis=0),
+            )
+            self.peak = peak[-1]
+            self.peak_bar = peak_bar[-1]
+        self.count = total
+
+        if tc is not None:
+            self.total_tc -= np.where(valid, np.nan_to_num(_rows(tc, self.n_strategies)), 0.0).sum(axis=0)
+        if position is not None:
+            self._update_trades(_rows(position, self.n_strategies), valid, eq, bar)
+        return self
+
+    def _update_trades(self, position, valid, eq, bar):
+        pos = _ffill(np.where(valid, np.nan_to_num(position), np.nan), self.position)
+        before, after = pos[:-1], pos[1:]
+        changed = valid & (after != before)
+        self.abs_change += np.abs(after - before).sum(axis=0)
+        self.position = pos[-1]
+
+        # every change closes the open trade (if any) and opens a new one
+        # (if the new state is not flat); events are in (strategy, time) order
+        s, t = np.nonzero(changed.T)
+        if len(s) == 0:
+            return
+        ev_before, ev_after = before[t, s], after[t, s]
+        ev_eq, ev_bar = eq[t, s], bar[t, s]
+        same = np.r_[False, s[1:] == s[:-1]]
+        entry_eq = np.where(same, np.r_[np.nan, ev_eq[:-1]], self.open_equity[s])
+        entry_bar = np.where(same, np.r_[np.nan, ev_bar[:-1]], self.open_bar[s])
+
+        closes = ev_before != 0
+        n = self.n_strategies
+        self.n_trades += np.bincount(s[closes], minlength=n)
+        self.n_wins += np.bincount(s[closes & (ev_eq > entry_eq)], minlength=n)
+        self.hold_bars += np.bincount(s[closes], weights=(ev_bar - entry_bar)[closes], minlength=n)
+
+        last = np.r_[s[1:] != s[:-1], True]
+        opens = ev_after[last] != 0
+        self.open_equity[s[last]] = np.where(opens, ev_eq[last], np.nan)
+        self.open_bar[s[last]] = np.where(opens, ev_bar[last], np.nan)
+
+    def result(self):
+        """
+        Dict of per-strategy arrays: total_return, sharpe, sortino, calmar,
+        annual_return, max_drawdown, max_drawdown_bars, drawdown_bars
+        (current time under water), turnover (position changes per year, in
+        units of full exposure), total_tc (dollars paid), n_trades (closed
+        trades), hit_rate, avg_holding_bars. Undefined ratios are 0.
+        """
+        td = self.trading_days
+        n = self.count
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(self.m2 / (n - 1))
+            sharpe = np.where(std > 0, self.mean * td / (std * np.sqrt(td)), 0.0)
+            downside = np.sqrt(self.down2 / n)
+            sortino = np.where(downside > 0, self.mean * td / (downside * np.sqrt(td)), 0.0)
+            growth = self.last / self.first
+            years = (n - 1) / td
+            annual = np.where(years > 0, np.sign(growth) * np.abs(growth) ** (1 / years) - 1, 0.0)
+            calmar = np.where(self.max_dd < 0, annual / -self.max_dd, 0.0)
+            turnover = np.where(n > 1, self.abs_change * td / (n - 1), 0.0)
+            hit_rate = np.where(self.n_trades > 0, self.n_wins / self.n_trades, 0.0)
+            avg_hold = np.where(self.n_trades > 0, self.hold_bars / self.n_trades, 0.0)
+        return {
+            "total_return": np.nan_to_num(growth - 1),
+            "sharpe": sharpe,
+            "sortino": sortino,
+            "calmar": np.nan_to_num(calmar),
+            "annual_return": np.nan_to_num(annual),
+            "max_drawdown": self.max_dd.copy(),
+            "max_drawdown_bars": self.max_dd_bars.copy(),
+            "drawdown_bars": np.where(n > 0, n - self.peak_bar, 0.0),
+            "turnover": turnover,
+            "total_tc": self.total_tc.copy(),
+            "n_trades": self.n_trades.copy(),
+            "hit_rate": hit_rate,
+            "avg_holding_bars": avg_hold,
+        }
+
+
+def _frame_values(a):
+    if isinstance(a, (pd.Series, pd.DataFrame)):
+        return a.to_numpy(dtype=float)
+    return None if a is None else np.asarray(a, dtype=float)
+
+
+def performance_metrics(equity, position=None, tc=None, trading_days=TRADING_DAYS):
+    """
+    StreamingMetrics over a whole history in one update.
+
+    equity: 1-D (one strategy) or (time x strategy); position / tc the same
+    shape, e.g. the "position" and "tc" columns of backtest_pair, or the
+    blocks from backtest_block. Returns a dict of floats for 1-D input, a
+    DataFrame with one row per column for a DataFrame, else a dict of arrays.
+    """
+    values = _frame_values(equity)
+    single = values.ndim == 1
+    block = values.reshape(-1, 1) if single else values
+    shape = lambda a: None if a is None else _frame_values(a).reshape(block.shape)
+    out = StreamingMetrics(block.shape[1], trading_days).update(
+        block, shape(position), shape(tc),
+    ).result()
+    if single:
+        return {k: float(v[0]) for k, v in out.items()}
+    if isinstance(equity, pd.DataFrame):
+        return pd.DataFrame(out, index=equity.columns)
+    return out
+
+
+def rolling_metrics(equity, window, position=None, trading_days=TRADING_DAYS):
+    """
+    Trailing-`window` versions of the headline metrics for a (time x
+    strategy) block (or 1-D series): return, sharpe, sortino, drawdown
+    (from the window's peak) and, with `position`, turnover. Rows before
+    the first full window are NaN. Returns DataFrames shaped like the input
+    (one column for 1-D input).
+    """
+    index = equity.index if isinstance(equity, (pd.Series, pd.DataFrame)) else None
+    values = _frame_values(equity)
+    eq = pd.DataFrame(values.reshape(len(values), -1), index=index)
+    if isinstance(equity, pd.DataFrame):
+        eq.columns = equity.columns
+
+    ret = eq.pct_change(fill_method=None).fillna(0.0)
+    mean = ret.rolling(window).mean()
+    std = ret.rolling(window).std()
+    downside = np.sqrt((ret.clip(upper=0.0) ** 2).rolling(window).mean())
+    scale = np.sqrt(trading_days)
+    out = {
+        "return": eq / eq.shift(window - 1) - 1,
+        "sharpe": (mean * scale / std).where(std > 0, 0.0).where(std.notna()),
+        "sortino": (mean * scale / downside).where(downside > 0, 0.0).where(downside.notna()),
+        "drawdown": eq / eq.rolling(window).max() - 1,
+    }
+    if position is not None:
+        pos = pd.DataFrame(_frame_values(position).reshape(eq.shape), index=eq.index, columns=eq.columns)
+        change = pos.diff().abs().fillna(0.0)
+        out["turnover"] = change.rolling(window).sum() * trading_days / window
+    return out
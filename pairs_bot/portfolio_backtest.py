@@ -0,0 +1,124 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pairs_bot.backtest import backtest_block
+from pairs_bot.metrics import infer_periods_per_year, performance_metrics
+from pairs_bot.signals import batch_signal_positions
+from pairs_bot.spread_model import rolling_hedge_ratio
+
+
+def _compact(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Move each pair's jointly valid rows to the top of its column, which is
+    what align_pair's dropna does for one pair. Returns the compacted blocks
+    (NaN padded at the bottom), the source row of every compacted cell and
+    the per-pair lengths.
+    """
+    valid = np.isfinite(x) & np.isfinite(y)
+    # stable sort puts valid rows first, in time order
+    rows = np.argsort(~valid, axis=0, kind="stable")
+    lengths = valid.sum(axis=0)
+    pad = np.arange(len(x))[:, None] >= lengths[None, :]
+    xc = np.where(pad, np.nan, np.take_along_axis(x, rows, axis=0))
+    yc = np.where(pad, np.nan, np.take_along_axis(y, rows, axis=0))
+    return xc, yc, rows, lengths
+
+
+def _pct_change(v: np.ndarray) -> np.ndarray:
+    out = np.zeros(v.shape)
+    out[1:] = v[1:] / v[:-1] - 1
+    return out
+
+
+def backtest_pairs(
+    prices: pd.DataFrame,
+    pairs: Sequence[Tuple[str, str]],
+    lookback: int = 60,
+    entry_z: float = 2.0,
+    exit_z: float = 0.5,
+    stop_z: float = 4.0,
+    initial_capital: float = 100000,
+    tc_bps: float = 2.0,
+    trade_from=None,
+) -> Dict:
+    """
+    Backtest many pairs from the wide `prices` frame in one pass.
+
+    Each pair runs the same align_pair -> build_spread -> generate_signals ->
+    backtest_pair chain, but every stage works on (time, pair) NumPy blocks
+    and nothing is copied per pair. Each pair gets `initial_capital`; the
+    portfolio equity is the sum of the pair equities (a pair sits at
+    `initial_capital` before its first bar and holds its last value after).
+
+    parameters
+    ----------
+    pairs : sequence of (x, y) tickers, e.g. [(p["x"], p["y"]) for p in scan]
+    trade_from : index label, optional
+        Rows before this label only warm up the hedge ratio and z-score; no
+        positions are taken there, so equity stays at `initial_capital`.
+
+    returns
+    -------
+    {
+        "stats": List[Dict],        # per pair, same keys as backtest_pair's stats
+        "equity": DataFrame,        # time x pair, NaN where a pair has no data
+        "position": DataFrame,      # time x pair
+        "portfolio": {"equity": Series, "returns": Series, "stats": Dict},
+    }
+    """
+    labels = [f"{x}-{y}" for x, y in pairs]
+    xs = prices[[x for x, _ in pairs]].to_numpy(dtype=float)
+    ys = prices[[y for _, y in pairs]].to_numpy(dtype=float)
+    xc, yc, rows, _ = _compact(xs, ys)
+
+    alpha, beta = rolling_hedge_ratio(yc, xc, lookback)
+    spread = yc - (alpha + beta * xc)
+    rolling = pd.DataFrame(spread).rolling(lookback)
+    zscore = ((spread - rolling.mean().values) / rolling.std().values)
+
+    if trade_from is not None:
+        # NaN z never triggers a transition, so the warmup stays flat
+        warm = int(prices.index.searchsorted(trade_from))
+        zscore[rows < warm] = np.nan
+
+    position = batch_signal_positions(zscore, entry_z, exit_z, stop_z)
+    position[np.isnan(xc)] = np.nan
+
+    _, _, tc_c, equity_c = backtest_block(
+        position, beta, _pct_change(xc), _pct_change(yc),
+        initial_capital=initial_capital, tc_bps=tc_bps,
+    )
+
+    # annualize by bar frequency (252 for daily closes)
+    per_year = infer_periods_per_year(prices.index)
+    # every pair scored in one pass; the NaN tail of short columns is skipped
+    block = performance_metrics(equity_c, position, tc_c, trading_days=per_year)
+    stats: List[Dict] = [{k: float(v[j]) for k, v in block.items()} for j in range(len(pairs))]
+
+    # scatter the compacted rows back onto the shared time index
+    equity = np.full(xs.shape, np.nan)
+    pos = np.full(xs.shape, np.nan)
+    tc = np.zeros(xs.shape)
+    cols = np.broadcast_to(np.arange(len(pairs)), rows.shape)
+    filled = ~np.isnan(xc)
+    equity[rows[filled], cols[filled]] = equity_c[filled]
+    pos[rows[filled], cols[filled]] = position[filled]
+    tc[rows[filled], cols[filled]] = tc_c[filled]
+
+    equity_df = pd.DataFrame(equity, index=prices.index, columns=labels)
+    port_equity = equity_df.ffill().fillna(initial_capital).sum(axis=1)
+    port_returns = port_equity.pct_change().fillna(0.0)
+
+    return {
+        "stats": stats,
+        "equity": equity_df,
+        "position": pd.DataFrame(pos, index=prices.index, columns=labels),
+        "portfolio": {
+            "equity": port_equity,
+            "returns": port_returns,
+            # trade stats are per pair; here they stay 0
+            "stats": performance_metrics(port_equity, tc=tc.sum(axis=1), trading_days=per_year),
+        },
+    }
@@ -0,0 +1,209 @@
+import json
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class PriceSource:
+    """
+    Where the store gets prices it does not have yet.
+    fetch() returns a wide frame (index = dates, columns = tickers) covering
+    [start, end) for one field at one bar interval ("1d", "1m", ...).
+    """
+
+    def fetch(self, tickers: Sequence[str], start, end, field: str = "Close", interval: str = "1d") -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YFinanceSource(PriceSource):
+    def __init__(self, auto_adjust: bool = False):
+        self.auto_adjust = auto_adjust
+
+    def fetch(self, tickers, start, end, field="Close", interval="1d"):
+        import yfinance as yf
+
+        tickers = list(tickers)
+        data = yf.download(
+            tickers, start=start, end=end, interval=interval, auto_adjust=self.auto_adjust,
+        )[field]
+        if isinstance(data, pd.Series):
+            data = data.to_frame(tickers[0])
+        return data
+
+
+class FrameSource(PriceSource):
+    """
+    Serve prices from an in-memory frame (or a CSV on disk), e.g. a test
+    fixture, instead of the network. Frames are served as-is for any
+    interval, so give it bars of the interval you request.
+    """
+
+    def __init__(self, frames):
+        # frames: wide DataFrame for a single field, or {field: DataFrame}
+        if isinstance(frames, pd.DataFrame):
+            frames = {"Close": frames}
+        self.frames = frames
+        self.calls: List[Tuple[Tuple[str, ...], pd.Timestamp, pd.Timestamp]] = []
+
+    @classmethod
+    def from_csv(cls, path: str, field: str = "Close") -> "FrameSource":
+        return cls({field: pd.read_csv(path, index_col=0, parse_dates=True)})
+
+    def fetch(self, tickers, start, end, field="Close", interval="1d"):
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        self.calls.append((tuple(tickers), start, end))
+        frame = self.frames[field]
+        cols = [t for t in tickers if t in frame.columns]
+        return frame.loc[(frame.index >= start) & (frame.index < end), cols]
+
+
+class PriceStore:
+    """
+    Per-ticker, per-field columnar price cache on disk:
+
+        <root>/<field>/<TICKER>/dates.npy   int64 ns timestamps, sorted
+        <root>/<field>/<TICKER>/values.npy  float64
+        <root>/<field>/<TICKER>/meta.json   {"start": ..., "end": ...}
+
+    Daily bars live directly under <root>; other intervals under
+    <root>/<interval>/ (e.g. .price_cache/1m/Close/SPY/). Intraday timestamps
+    are kept as exchange-local wall time.
+
+    meta records the [start, end) range already requested from the source, so
+    only missing ranges are fetched. Arrays are read memory-mapped.
+
+    on_update: called with the list of tickers whose stored prices changed
+    after each update(), e.g. ScanCache.invalidate.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        source: Optional[PriceSource] = None,
+        on_update: Optional[Callable[[List[str]], object]] = None,
+    ):
+        self.root = root
+        self.source = source if source is not None else YFinanceSource()
+        self.on_update = on_update
+
+    def _dir(self, ticker: str, field: str, interval: str = "1d") -> str:
+        if interval == "1d":
+            return os.path.join(self.root, field, ticker)
+        return os.path.join(self.root, interval, field, ticker)
+
+    def _coverage(self, ticker: str, field: str, interval: str = "1d") -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        path = os.path.join(self._dir(ticker, field, interval), "meta.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            meta = json.load(f)
+        return pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+
+    def _read(self, ticker: str, field: str, interval: str = "1d") -> Tuple[np.ndarray, np.ndarray]:
+        d = self._dir(ticker, field, interval)
+        if not os.path.exists(os.path.join(d, "dates.npy")):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        dates = np.load(os.path.join(d, "dates.npy"), mmap_mode="r")
+        values = np.load(os.path.join(d, "values.npy"), mmap_mode="r")
+        return dates, values
+
+    def _write(self, ticker, field, dates, values, start, end, interval="1d"):
+        d = self._dir(ticker, field, interval)
+        os.makedirs(d, exist_ok=True)
+        # write to temp files and swap in, so a crash never leaves a torn entry
+        for name, arr in (("dates", dates), ("values", values)):
+            tmp = os.path.join(d, f"{name}.tmp.npy")
+            np.save(tmp, arr)
+            os.replace(tmp, os.path.join(d, f"{name}.npy"))
+        tmp = os.path.join(d, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"start": start.isoformat(), "end": end.isoformat()}, f)
+        os.replace(tmp, os.path.join(d, "meta.json"))
+
+    def _missing_ranges(self, ticker, field, start, end, interval="1d"):
+        coverage = self._coverage(ticker, field, interval)
+        if coverage is None:
+            return [(start, end)]
+        cov_start, cov_end = coverage
+        if end <= cov_start or start >= cov_end:
+            # disjoint request: fetch the gap too so coverage stays one range
+            return [(min(start, cov_start), max(end, cov_end))]
+        ranges = []
+        if start < cov_start:
+            ranges.append((start, cov_start))
+        if end > cov_end:
+            ranges.append((cov_end, end))
+        return ranges
+
+    def _merge(self, ticker, field, fetched: pd.Series, start, end, interval="1d"):
+        dates, values = self._read(ticker, field, interval)
+        old = pd.Series(np.asarray(values), index=pd.to_datetime(np.asarray(dates)))
+        fetched = fetched.dropna()
+        fetched.index = pd.DatetimeIndex(fetched.index).tz_localize(None).as_unit("ns")
+        merged = pd.concat([old[~old.index.isin(fetched.index)], fetched]).sort_index()
+
+        coverage = self._coverage(ticker, field, interval)
+        if coverage is not None:
+            start, end = min(start, coverage[0]), max(end, coverage[1])
+        self._write(
+            ticker, field,
+            merged.index.asi8.astype(np.int64),
+            merged.values.astype(float),
+            start, end, interval,
+        )
+
+    def update(self, tickers: Sequence[str], start, end, field: str = "Close", interval: str = "1d") -> None:
+        """
+        Fetch whatever part of [start, end) is not cached yet. Tickers missing
+        the same range are fetched together in one source call.
+        """
+        start = pd.Timestamp(start)
+        # never mark today or the future as covered; those bars are incomplete
+        end = min(pd.Timestamp(end), pd.Timestamp.today().normalize())
+        if end <= start:
+            return
+
+        by_range: Dict[Tuple[pd.Timestamp, pd.Timestamp], List[str]] = {}
+        for t in tickers:
+            for rng in self._missing_ranges(t, field, start, end, interval):
+                by_range.setdefault(rng, []).append(t)
+
+        changed = set()
+        for (lo, hi), group in by_range.items():
+            data = self.source.fetch(group, lo, hi, field=field, interval=interval)
+            for t in group:
+                fetched = data[t] if t in data.columns else pd.Series(dtype=float)
+                self._merge(t, field, fetched, lo, hi, interval)
+                if fetched.notna().any():
+                    changed.add(t)
+        if changed and self.on_update is not None:
+            self.on_update(sorted(changed))
+
+    def load(self, tickers: Sequence[str], start, end, field: str = "Close", interval: str = "1d") -> pd.DataFrame:
+        """
+        Read [start, end) for `tickers` from disk only (no fetching).
+        """
+        lo = pd.Timestamp(start).as_unit("ns").value
+        hi = pd.Timestamp(end).as_unit("ns").value
+        slices = []
+        for t in tickers:
+            dates, values = self._read(t, field, interval)
+            i, j = np.searchsorted(dates, [lo, hi])
+            slices.append((dates[i:j], values[i:j]))
+
+        # scatter every ticker into one preallocated block on the union of dates
+        index = np.unique(np.concatenate([d for d, _ in slices])) if slices else np.empty(0, np.int64)
+        block = np.full((len(index), len(slices)), np.nan)
+        for k, (dates, values) in enumerate(slices):
+            block[np.searchsorted(index, dates), k] = values
+        return pd.DataFrame(
+            block,
+            index=pd.DatetimeIndex(index.astype("datetime64[ns]"), name="Date"),
+            columns=list(tickers),
+        )
+
+    def get(self, tickers: Sequence[str], start, end, field: str = "Close", interval: str = "1d") -> pd.DataFrame:
+        self.update(tickers, start, end, field=field, interval=interval)
+        return self.load(tickers, start, end, field=field, interval=interval)
@@ -0,0 +1,117 @@
+"""
+Persistent cache of per-pair scan statistics for find_cointegrated_pairs.
+
+Entries hold the raw test outputs of one pair (n, corr, pvalue, beta,
+adf_p, hurst, ac1), not a pass / fail verdict, so a rerun with different
+thresholds is re-filtered from the cache without running a single test.
+Keys hash the pair, the test method and the pair's aligned prices (their
+date range and values), so changed or extended data never hits a stale
+entry.
+"""
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from pairs_bot.fingerprint import cache_key, frame_fingerprint
+
+_FILE = "scan_stats.json"
+
+
+class ScanCache:
+    """
+    LRU map of pair key -> raw statistics, holding at most `max_entries`
+    pairs, saved as one JSON file under `cache_dir` (memory only if None).
+
+    Pass it as find_cointegrated_pairs(..., cache=cache). invalidate() drops
+    the entries of tickers whose prices changed; it has the signature of the
+    PriceStore on_update hook, e.g.
+    download_prices(..., on_update=cache.invalidate).
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 50_000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, _FILE)
+            if os.path.exists(path):
+                with open(path) as f:
+                    # saved oldest first, so the LRU order survives a reload
+                    self._entries.update(json.load(f))
+                self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def pair_key(x: str, y: str, method: str, joined: pd.DataFrame) -> str:
+        """
+        Key of one pair's statistics: tickers, test method, date range and a
+        content hash of the aligned prices (fingerprint.frame_fingerprint).
+        """
+        if len(joined):
+            span = (str(joined.index[0]), str(joined.index[-1]))
+        else:
+            span = (None, None)
+        return cache_key("pair", x, y, method, span, frame_fingerprint(joined))
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        self._dirty = True  # recency changed
+        return entry["stats"]
+
+    def put(self, key: str, x: str, y: str, stats: Dict) -> None:
+        self._entries[key] = {"x": x, "y": y, "stats": stats}
+        self._entries.move_to_end(key)
+        self._evict()
+        self._dirty = True
+
+    def _evict(self) -> None:
+        # least recently used first
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._dirty = True
+
+    def invalidate(self, tickers: Optional[Iterable[str]] = None) -> int:
+        """
+        Drop every entry involving one of `tickers` (all entries if None).
+        Returns the number dropped.
+        """
+        if tickers is None:
+            dropped = list(self._entries)
+        else:
+            tickers = set(tickers)
+            dropped = [
+                k for k, e in self._entries.items() if e["x"] in tickers or e["y"] in tickers
+            ]
+        for k in dropped:
+            del self._entries[k]
+        if dropped:
+            self._dirty = True
+            self.save()
+        return len(dropped)
+
+    def save(self) -> None:
+        """
+        Write the entries to disk (atomically), if anything changed.
+        """
+        if self.cache_dir is None or not self._dirty:
+            return
+        path = os.path.join(self.cache_dir, _FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, path)
+        self._dirty = False
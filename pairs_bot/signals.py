@@ -1,13 +1,18 @@
 import numpy as np
 
-def generate_signals(df, entry_z=2.0, exit_z=0.5, stop_z=4.0):
-    
-    df = df.copy()
-    z = df["zscore"].values
-    position = np.zeros(len(df)) #+1 is long, -1 is short, 0 is flat
-    state = 0 # same idea as the position with -1,1,0
+
+def signal_positions(z, entry_z=2.0, exit_z=0.5, stop_z=4.0, initial_state=0):
+    """
+    Hysteresis state machine behind generate_signals, on a plain z-score array.
+    initial_state continues an earlier run: pass its last state and, as z[0],
+    its last z-score (row 0 is never traded).
+    """
+    # plain Python floats are much cheaper to compare than NumPy scalars
+    z = np.asarray(z, dtype=float).tolist()
+    position = [0.0] * len(z) #+1 is long, -1 is short, 0 is flat
+    state = initial_state # same idea as the position with -1,1,0
     
-    for i in range(1, len(df)):
+    for i in range(1, len(z)):
         if state == 0:
             if z[i] > entry_z: 
                 state = -1  # short
@@ -26,9 +31,120 @@ def generate_signals(df, entry_z=2.0, exit_z=0.5, stop_z=4.0):
 
         
         position[i] = state
+
+    return np.asarray(position, dtype=float)
+
+
+def generate_signals(df, entry_z=2.0, exit_z=0.5, stop_z=4.0):
     
-    df["position"] = position
+    df = df.copy()
+    df["position"] = signal_positions(df["zscore"].values, entry_z, exit_z, stop_z)
     
     return df
 
-    
\ No newline at end of file
+
+def _next_true(cond):
+    # next_idx[i] = first j >= i with cond[j], else len(cond); one extra row
+    # at the end so lookups at i = len(cond) are valid
+    n = len(cond)
+    idx = np.where(cond, np.arange(n)[:, None], n)
+    idx = np.minimum.accumulate(idx[::-1], axis=0)[::-1]
+    return np.vstack([idx, np.full((1, cond.shape[1]), n)])
+
+
+# below this many series the per-trade walk runs on Python ints per column;
+# wider blocks advance all series together with array ops
+_NARROW_BLOCK = 8
+
+
+def _walk_column(delta, next_entry, go_short, next_exit_long, next_exit_short):
+    n = len(delta) - 1
+    next_entry = next_entry.tolist()
+    next_exit_long = next_exit_long.tolist()
+    next_exit_short = next_exit_short.tolist()
+    starts, ends, states = [], [], []
+    cursor = 0
+    while True:
+        k = next_entry[cursor]
+        if k >= n:
+            break
+        state = -1.0 if go_short[k] else 1.0
+        # exits are checked from the bar after entry
+        end = (next_exit_long if state > 0 else next_exit_short)[min(k + 1, n)]
+        starts.append(k)
+        ends.append(end)
+        states.append(state)
+        if end >= n:
+            break
+        # the exit bar itself cannot re-enter; search again from the next one
+        cursor = end + 1
+    states = np.asarray(states)
+    np.add.at(delta, starts, states)
+    np.add.at(delta, ends, -states)
+
+
+def _walk_block(delta, next_entry, go_short, next_exit_long, next_exit_short):
+    n, m = go_short.shape
+    cols = np.arange(m)
+    cursor = np.zeros(m, dtype=int)
+    active = np.ones(m, dtype=bool)
+    while True:
+        start = next_entry[cursor, cols]
+        active &= start < n
+        if not active.any():
+            break
+        c = cols[active]
+        k = start[active]
+        state = np.where(go_short[k, c], -1.0, 1.0)
+        after = np.minimum(k + 1, n)
+        end = np.where(state > 0, next_exit_long[after, c], next_exit_short[after, c])
+        delta[k, c] += state
+        delta[end, c] -= state
+        cursor[c] = np.minimum(end + 1, n)
+        active[c] &= end < n
+
+
+def batch_signal_positions(z, entry_z=2.0, exit_z=0.5, stop_z=4.0):
+    """
+    signal_positions for a (time, series) block of z-scores, with scalar or
+    per-column thresholds. Returns the position block (same shape as z).
+
+    Instead of stepping bar by bar, it jumps from event to event: the next bar
+    where each entry / exit condition holds is precomputed for every row with
+    a reverse running minimum, and every series then advances one trade per
+    iteration. Work is O(T) vectorized plus one step per trade of the busiest
+    series. Matches the loop exactly, including NaN z (no transition) and the
+    first bar always being flat.
+    """
+    z = np.asarray(z, dtype=float)
+    one_d = z.ndim == 1
+    if one_d:
+        z = z[:, None]
+    n, m = z.shape
+    if n == 0:
+        # nothing to step; same (float) positions as a non-empty block
+        return np.zeros(0) if one_d else np.zeros((0, m))
+    entry_z = np.broadcast_to(np.asarray(entry_z, dtype=float), (m,))
+    exit_z = np.broadcast_to(np.asarray(exit_z, dtype=float), (m,))
+    stop_z = np.broadcast_to(np.asarray(stop_z, dtype=float), (m,))
+
+    with np.errstate(invalid="ignore"):
+        go_short = z > entry_z
+        entry = go_short | (z < -entry_z)
+        exit_long = (z > -exit_z) | (z < -stop_z)
+        exit_short = (z < exit_z) | (z > stop_z)
+    entry[0] = False  # the loop starts at bar 1
+    next_entry = _next_true(entry)
+    next_exit_long = _next_true(exit_long)
+    next_exit_short = _next_true(exit_short)
+
+    delta = np.zeros((n + 1, m))
+    if m <= _NARROW_BLOCK:
+        for c in range(m):
+            _walk_column(delta[:, c], next_entry[:, c], go_short[:, c],
+                         next_exit_long[:, c], next_exit_short[:, c])
+    else:
+        _walk_block(delta, next_entry, go_short, next_exit_long, next_exit_short)
+
+    position = np.cumsum(delta[:n], axis=0)
+    return position[:, 0] if one_d else position
@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 
 
 def estimate_hedge_ratio(y, x):
@@ -8,22 +9,329 @@ def estimate_hedge_ratio(y, x):
     alpha, beta = np.linalg.lstsq(X, y, rcond=None)[0]
     return alpha, beta
 
-def build_spread(df, lookback=60):
-    df = df.copy()
-    df = df[["X", "Y"]].dropna()
-    # this method uses a rolling lookback window so the spread track shifts,
-    # keeping beta in sync with the same window used to calculate mean and std.
+
+# Tolerance of the running-sum rolling OLS against the per-window lstsq
+# reference, relative to max(1, |value|), for lookbacks of 60+ rows (worst
+# gap measured on cointegrated_pair series: ~3e-9 at 60; shorter windows get
+# close to or past it, ~1e-7 at 10-20). Ill-conditioned windows (short
+# lookback, almost constant x) only agree to the conditioning of the window,
+# as two different solvers would.
+ROLLING_OLS_RTOL = 1e-7
+
+# window sums are taken from cumsums over re-centered segments of this many
+# rows, so float error does not grow with the length of the series
+_SEGMENT = 4096
+
+
+def _anchor(v):
+    # segment mean, taken column by column on contiguous copies so a column of
+    # a 2-D block is summed exactly like the same series in 1-D
+    if v.ndim == 1:
+        return v.mean()
+    out = np.full(v.shape[1], np.nan)
+    for k in range(v.shape[1]):
+        col = v[:, k]
+        col = col[np.isfinite(col)]
+        if len(col):
+            out[k] = col.mean()
+    return out
+
+
+def _window_sums(x, y, lookback):
+    n = len(x)
+    sx = np.empty(x.shape)
+    sy = np.empty(x.shape)
+    sxx = np.empty(x.shape)
+    sxy = np.empty(x.shape)
+    shift_x = np.empty(x.shape)
+    shift_y = np.empty(x.shape)
+    for lo in range(0, n, _SEGMENT):
+        hi = min(n, lo + _SEGMENT)
+        pad = min(lo, lookback - 1)
+        cx = x[lo - pad:hi]
+        cy = y[lo - pad:hi]
+        x0 = _anchor(cx)
+        y0 = _anchor(cy)
+        cx = cx - x0
+        cy = cy - y0
+        for out, v in ((sx, cx), (sy, cy), (sxx, cx * cx), (sxy, cx * cy)):
+            c = np.concatenate((np.zeros((1,) + v.shape[1:]), np.cumsum(v, axis=0)))
+            end = np.arange(pad + 1, pad + 1 + hi - lo)
+            out[lo:hi] = c[end] - c[np.maximum(end - lookback, 0)]
+        shift_x[lo:hi] = x0
+        shift_y[lo:hi] = y0
+    return sx, sy, sxx, sxy, shift_x, shift_y
+
+
+def rolling_hedge_ratio(y, x, lookback=60):
+    """
+    Rolling alpha/beta of y ~ alpha + beta * x over a trailing window of up to
+    `lookback` rows, updated with running sums instead of a solve per row.
+    Windows with no spread in x (e.g. the first row) fall back to
+    estimate_hedge_ratio so the output matches the lstsq reference.
+
+    x and y may also be (time, series) blocks; each column is an independent
+    series, and NaN rows at the end of a column (ragged lengths) stay NaN.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    sx, sy, sxx, sxy, x0, y0 = _window_sums(x, y, lookback)
+    count = np.minimum(np.arange(1, n + 1), lookback).astype(float)
+    if x.ndim == 2:
+        count = count[:, None]
+    mx = sx / count
+    my = sy / count
+    vxx = sxx - count * mx * mx
+    vxy = sxy - count * mx * my
+
+    valid = np.isfinite(x) & np.isfinite(y)
+    degenerate = valid & ((count < 2) | ~(vxx > 1e-12 * (vxx + count * (mx + x0) ** 2)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        betas = np.where(degenerate, 0.0, vxy / vxx)
+    alphas = (my + y0) - betas * (mx + x0)
+
+    for idx in zip(*np.nonzero(degenerate)):
+        i, col = idx[0], idx[1:]
+        start = max(0, i - lookback + 1)
+        window = (slice(start, i + 1),) + col
+        alphas[idx], betas[idx] = estimate_hedge_ratio(y[window], x[window])
+    return alphas, betas
+
+
+def _rolling_hedge_ratio_lstsq(y, x, lookback=60):
+    # reference implementation: one lstsq per window
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
     alphas = []
     betas = []
-    
-    for i in range(len(df)):
+    for i in range(len(x)):
         start = max(0, i - lookback + 1)
-        window = df.iloc[start: i + 1]
-        a, b = estimate_hedge_ratio(window['Y'], window['X'])
+        a, b = estimate_hedge_ratio(y[start: i + 1], x[start: i + 1])
         alphas.append(a)
         betas.append(b)
-        
-        
+    return np.asarray(alphas), np.asarray(betas)
+
+
+# Kalman hedge ratio: random-walk state [alpha, beta] with per-step state
+# noise delta / (1 - delta) on each coefficient
+KALMAN_DELTA = 1e-4
+
+
+def _kalman_step(state, x, y, vw, ve):
+    # one predict + update on plain floats; state = (a, b, p00, p01, p11).
+    # Returns the new state, the innovation y - (a + b * x) from the prior
+    # coefficients, and its variance.
+    a, b, p00, p01, p11 = state
+    r00 = p00 + vw
+    r11 = p11 + vw
+    g0 = r00 + p01 * x
+    g1 = p01 + r11 * x
+    q = g0 + g1 * x + ve
+    e = y - (a + b * x)
+    k0 = g0 / q
+    k1 = g1 / q
+    return (
+        a + k0 * e,
+        b + k1 * e,
+        r00 - g0 * k0,
+        p01 - g0 * k1,
+        r11 - g1 * k1,
+    ), e, q
+
+
+def _kalman_init(y, x):
+    # warm start from an OLS fit: coefficients, their covariance and the
+    # residual variance (the default observation noise)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    alpha, beta = estimate_hedge_ratio(y, x)
+    resid = y - (alpha + beta * x)
+    ve = float(resid.var(ddof=2)) if len(x) > 2 else 1.0
+    X = np.vstack([np.ones(len(x)), x]).T
+    cov = ve * np.linalg.pinv(X.T @ X)
+    return (float(alpha), float(beta), float(cov[0, 0]), float(cov[0, 1]), float(cov[1, 1])), ve
+
+
+class KalmanHedgeRatio:
+    """
+    Streaming Kalman filter for y = alpha + beta * x with [alpha, beta]
+    following a random walk. O(1) per update.
+
+    update(x, y) returns (alpha, beta, innovation, variance), where alpha and
+    beta are the estimates before seeing y, so innovation / sqrt(variance) is
+    an out-of-sample z-score of the spread.
+    """
+
+    def __init__(self, alpha=0.0, beta=0.0, cov=None, delta=KALMAN_DELTA, obs_var=1e-3):
+        cov = np.zeros((2, 2)) if cov is None else np.asarray(cov, dtype=float)
+        self.state = (float(alpha), float(beta), float(cov[0, 0]), float(cov[0, 1]), float(cov[1, 1]))
+        self.vw = delta / (1 - delta)
+        self.ve = float(obs_var)
+
+    @classmethod
+    def from_history(cls, y, x, delta=KALMAN_DELTA, obs_var=None):
+        """
+        Filter started from an OLS fit on (y, x); obs_var defaults to the
+        fit's residual variance.
+        """
+        state, ve = _kalman_init(y, x)
+        kf = cls(delta=delta, obs_var=ve if obs_var is None else obs_var)
+        kf.state = state
+        return kf
+
+    @property
+    def alpha(self):
+        return self.state[0]
+
+    @property
+    def beta(self):
+        return self.state[1]
+
+    def update(self, x, y):
+        a, b = self.state[0], self.state[1]
+        self.state, e, q = _kalman_step(self.state, float(x), float(y), self.vw, self.ve)
+        return a, b, e, q
+
+
+def kalman_hedge_ratio(y, x, delta=KALMAN_DELTA, obs_var=None, warmup=60):
+    """
+    Batch KalmanHedgeRatio over whole series, started from an OLS fit on the
+    first `warmup` rows. Returns (alpha, beta, innovation, variance) arrays,
+    with alpha / beta the prior estimates behind each innovation. The first
+    `warmup` rows were used to start the filter, so their innovations are
+    in-sample.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    kf = KalmanHedgeRatio.from_history(y[:warmup], x[:warmup], delta, obs_var)
+    alphas = [0.0] * n
+    betas = [0.0] * n
+    innov = [0.0] * n
+    var = [0.0] * n
+    state, vw, ve = kf.state, kf.vw, kf.ve
+    for i, (xi, yi) in enumerate(zip(x.tolist(), y.tolist())):
+        alphas[i] = state[0]
+        betas[i] = state[1]
+        state, innov[i], var[i] = _kalman_step(state, xi, yi, vw, ve)
+    return np.asarray(alphas), np.asarray(betas), np.asarray(innov), np.asarray(var)
+
+
+def rolling_basket_hedge(y, X, lookback=60):
+    """
+    Rolling multiple regression y ~ alpha + X @ beta over a trailing window
+    of up to `lookback` rows (X: time x legs), from running sums of the
+    cross-products, taken over re-centered segments as in
+    rolling_hedge_ratio. Windows too short or too collinear to solve fall
+    back to a least-squares fit of the window. With one leg this is
+    rolling_hedge_ratio up to float rounding.
+
+    returns (alphas (time,), betas (time, legs))
+    """
+    y = np.asarray(y, dtype=float)
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+    n, k = X.shape
+    Z = np.column_stack([X, y])
+    alphas = np.empty(n)
+    betas = np.empty((n, k))
+    for lo in range(0, n, _SEGMENT):
+        hi = min(n, lo + _SEGMENT)
+        pad = min(lo, lookback - 1)
+        seg = Z[lo - pad:hi]
+        anchor = seg.mean(axis=0)
+        c = seg - anchor
+        s1 = np.concatenate((np.zeros((1, k + 1)), np.cumsum(c, axis=0)))
+        s2 = np.concatenate((
+            np.zeros((1, k + 1, k + 1)), np.cumsum(c[:, :, None] * c[:, None, :], axis=0),
+        ))
+        end = np.arange(pad + 1, pad + 1 + hi - lo)
+        start = np.maximum(end - lookback, 0)
+        count = (end - start).astype(float)
+        mean = (s1[end] - s1[start]) / count[:, None]
+        cov = (s2[end] - s2[start]) - count[:, None, None] * mean[:, :, None] * mean[:, None, :]
+        cxx = cov[:, :k, :k]
+        cxy = cov[:, :k, k]
+
+        # same scale-free degeneracy rule as rolling_hedge_ratio, on the
+        # determinant relative to the product of the leg variances
+        scale = np.prod(np.diagonal(cxx, axis1=1, axis2=2), axis=1)
+        with np.errstate(invalid="ignore"):
+            degenerate = (count <= k) | ~(np.abs(np.linalg.det(cxx)) > 1e-12 * scale)
+        b = np.zeros((hi - lo, k))
+        ok = ~degenerate
+        if ok.any():
+            b[ok] = np.linalg.solve(cxx[ok], cxy[ok][:, :, None])[:, :, 0]
+        betas[lo:hi] = b
+        alphas[lo:hi] = (mean[:, k] + anchor[k]) - np.einsum("ij,ij->i", mean[:, :k] + anchor[:k], b)
+        for r in np.flatnonzero(degenerate).tolist():
+            i = lo + r
+            w = slice(max(0, i - lookback + 1), i + 1)
+            A = np.column_stack([np.ones(w.stop - w.start), X[w]])
+            coef = np.linalg.lstsq(A, y[w], rcond=None)[0]
+            alphas[i], betas[i] = coef[0], coef[1:]
+    return alphas, betas
+
+
+def build_basket_spread(prices, lookback=60):
+    """
+    N-leg build_spread: the first column of `prices` (a wide frame of one
+    basket's prices, e.g. from find_cointegrated_baskets' "tickers") is
+    regressed on the others over a rolling window.
+
+    Output has the price columns plus alpha, beta_<ticker> per hedge leg,
+    spread = first - (alpha + sum beta * leg) and its rolling z-score, so
+    generate_signals works on it unchanged.
+    """
+    df = prices.dropna()
+    legs = list(df.columns[1:])
+    alphas, betas = rolling_basket_hedge(df.iloc[:, 0].values, df[legs].values, lookback)
+    out = {"alpha": alphas}
+    out.update({f"beta_{t}": betas[:, k] for k, t in enumerate(legs)})
+    spread = df.iloc[:, 0].values - (alphas + np.einsum("ij,ij->i", df[legs].values, betas))
+    out["spread"] = spread
+    rolling = pd.Series(spread, index=df.index).rolling(lookback)
+    out["zscore"] = (spread - rolling.mean().values) / rolling.std().values
+    return pd.concat([df, pd.DataFrame(out, index=df.index)], axis=1)
+
+
+_HEDGE_RATIO_METHODS = {
+    "rolling": rolling_hedge_ratio,
+    "lstsq": _rolling_hedge_ratio_lstsq,
+}
+_SPREAD_METHODS = set(_HEDGE_RATIO_METHODS) | {"kalman"}
+
+
+def build_spread(df, lookback=60, method="rolling", delta=KALMAN_DELTA, obs_var=None):
+    """
+    method: "rolling" updates the window regression with running sums (O(n)),
+            "lstsq" re-solves every window and is kept as the reference,
+            "kalman" tracks alpha / beta with kalman_hedge_ratio; the spread
+            is the filter innovation and the z-score divides it by the
+            innovation std. The first `lookback` rows start the filter and
+            get no z-score. delta / obs_var only apply to "kalman".
+    """
+    if method not in _SPREAD_METHODS:
+        raise ValueError(f"Unknown hedge ratio method: {method}")
+    df = df.copy()
+    df = df[["X", "Y"]].dropna()
+    if method == "kalman":
+        alphas, betas, innov, var = kalman_hedge_ratio(
+            df["Y"].values, df["X"].values, delta, obs_var, warmup=lookback,
+        )
+        zscore = innov / np.sqrt(var)
+        zscore[:lookback] = np.nan
+        df["alpha"] = alphas
+        df["beta"] = betas
+        df["spread"] = innov
+        df["zscore"] = zscore
+        return df
+    # this method uses a rolling lookback window so the spread track shifts,
+    # keeping beta in sync with the same window used to calculate mean and std.
+    alphas, betas = _HEDGE_RATIO_METHODS[method](df["Y"].values, df["X"].values, lookback)
+
     df["alpha"] = alphas
     df["beta"] = betas
     df["spread"] = df["Y"] - (df["alpha"] + df["beta"] * df["X"])
@@ -0,0 +1,137 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pairs_bot.backtest import backtest_arrays
+from pairs_bot.data_loader import align_pair
+from pairs_bot.metrics import infer_periods_per_year, performance_metrics
+from pairs_bot.signals import batch_signal_positions
+from pairs_bot.spread_model import build_spread
+
+
+_worker_inputs: Dict[Tuple[int, int], Tuple[np.ndarray, ...]] = {}
+_worker_capital: float = 0.0
+_worker_periods: float = 252.0
+
+
+def _init_sweep_worker(inputs: Dict, initial_capital: float, periods_per_year: float) -> None:
+    global _worker_inputs, _worker_capital, _worker_periods
+    _worker_inputs = inputs
+    _worker_capital = initial_capital
+    _worker_periods = periods_per_year
+
+
+def _run_task(task) -> List[Dict]:
+    """
+    One (pair, lookback) with a slice of threshold combinations. Positions for
+    the whole slice come from one batched signal pass and are reused for every
+    tc_bps.
+    """
+    key, thresholds, tc_grid = task
+    z, beta, ret_x, ret_y = _worker_inputs[key]
+    entry, exit_, stop = (np.array(col, dtype=float) for col in zip(*thresholds))
+    # one column per threshold combination, all stepped in one batched pass
+    positions = batch_signal_positions(
+        np.broadcast_to(z[:, None], (len(z), len(thresholds))), entry, exit_, stop,
+    )
+    combos = [(c, tc_bps) for c in range(len(thresholds)) for tc_bps in tc_grid]
+    equity = np.empty((len(z), len(combos)))
+    tc = np.empty_like(equity)
+    for j, (c, tc_bps) in enumerate(combos):
+        _, _, tc[:, j], equity[:, j] = backtest_arrays(
+            positions[:, c], beta, ret_x, ret_y,
+            initial_capital=_worker_capital, tc_bps=tc_bps,
+        )
+    # score every combination of the slice in one block pass
+    stats = performance_metrics(
+        equity, positions[:, [c for c, _ in combos]], tc, trading_days=_worker_periods,
+    )
+    rows = []
+    for j, (c, tc_bps) in enumerate(combos):
+        entry_z, exit_z, stop_z = thresholds[c]
+        rows.append({
+            "pair": key[0],
+            "lookback": key[1],
+            "entry_z": entry_z,
+            "exit_z": exit_z,
+            "stop_z": stop_z,
+            "tc_bps": tc_bps,
+            **{name: float(values[j]) for name, values in stats.items()},
+        })
+    return rows
+
+
+def run_sweep(
+    prices: pd.DataFrame,
+    pairs: Sequence[Tuple[str, str]],
+    lookbacks: Sequence[int],
+    entry_zs: Sequence[float],
+    exit_zs: Sequence[float],
+    stop_zs: Sequence[float],
+    tc_bps: Sequence[float] = (2.0,),
+    initial_capital: float = 100000,
+    n_jobs: int = 1,
+    chunksize: int = 64,
+    periods_per_year: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Grid search over (lookback, entry_z, exit_z, stop_z, tc_bps) for each
+    (x, y) pair in `pairs`.
+
+    The spread and z-score are built once per (pair, lookback); only the
+    cheap signal + backtest stages run per combination, in chunks of
+    `chunksize` threshold combinations on a process pool of `n_jobs` workers
+    (1 = in-process, <= 0 = all cores). periods_per_year annualizes the
+    stats; inferred from prices.index by default, as in backtest_pair.
+
+    returns
+    -------
+    DataFrame with one row per combination: x, y, lookback, entry_z, exit_z,
+    stop_z, tc_bps and the performance_metrics columns, in grid order.
+    """
+    thresholds = list(itertools.product(entry_zs, exit_zs, stop_zs))
+    tc_grid = list(tc_bps)
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(prices.index)
+
+    inputs = {}
+    for p, (x, y) in enumerate(pairs):
+        df_pair = align_pair(prices, x, y)
+        for lookback in lookbacks:
+            df = build_spread(df_pair, lookback=lookback)
+            inputs[(p, lookback)] = (
+                df["zscore"].values,
+                df["beta"].values,
+                df["X"].pct_change().fillna(0.0).values,
+                df["Y"].pct_change().fillna(0.0).values,
+            )
+
+    tasks = [
+        (key, thresholds[k: k + chunksize], tc_grid)
+        for key in inputs
+        for k in range(0, len(thresholds), chunksize)
+    ]
+
+    if n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs == 1 or len(tasks) <= 1:
+        _init_sweep_worker(inputs, initial_capital, periods_per_year)
+        results = [_run_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_sweep_worker,
+            initargs=(inputs, initial_capital, periods_per_year),
+        ) as pool:
+            results = list(pool.map(_run_task, tasks))
+
+    table = pd.DataFrame([row for chunk in results for row in chunk])
+    if table.empty:
+        return table
+    table.insert(0, "x", [pairs[p][0] for p in table["pair"]])
+    table.insert(1, "y", [pairs[p][1] for p in table["pair"]])
+    return table.drop(columns="pair")
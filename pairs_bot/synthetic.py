@@ -0,0 +1,93 @@
+"""
+Synthetic price generators for benchmarks and offline experiments.
+
+Every generator takes a `seed`, so the same arguments always give the same
+frame.
+"""
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _index(n_bars, start, freq):
+    return pd.date_range(start, periods=n_bars, freq=freq, name="Date")
+
+
+def _ou(rng, n_bars, mean_reversion, noise):
+    # AR(1) form of an Ornstein-Uhlenbeck spread: s_t = (1 - k) s_{t-1} + noise * e_t
+    eps = rng.normal(0.0, noise, n_bars)
+    s = np.empty(n_bars)
+    level = 0.0
+    keep = 1.0 - mean_reversion
+    for i, e in enumerate(eps.tolist()):
+        level = keep * level + e
+        s[i] = level
+    return s
+
+
+def _random_walk(rng, n_bars, start_price, vol):
+    return start_price * np.exp(np.cumsum(rng.normal(0.0, vol, n_bars)))
+
+
+def cointegrated_pair(
+    n_bars=1000,
+    beta=1.5,
+    alpha=10.0,
+    mean_reversion=0.05,
+    noise=1.0,
+    x_vol=0.01,
+    x_start=100.0,
+    seed=None,
+    start="2000-01-03",
+    freq="B",
+):
+    """
+    One cointegrated pair as an align_pair-style frame with X and Y columns:
+    X is a geometric random walk and Y = alpha + beta * X + s, with s a
+    mean-reverting spread (mean_reversion per bar, `noise` std per bar).
+    """
+    rng = np.random.default_rng(seed)
+    x = _random_walk(rng, n_bars, x_start, x_vol)
+    y = alpha + beta * x + _ou(rng, n_bars, mean_reversion, noise)
+    return pd.DataFrame({"X": x, "Y": y}, index=_index(n_bars, start, freq))
+
+
+def synthetic_universe(
+    n_tickers=20,
+    n_bars=1000,
+    coint_fraction=0.5,
+    mean_reversion=0.05,
+    noise=1.0,
+    vol=0.01,
+    seed=None,
+    start="2000-01-03",
+    freq="B",
+) -> Tuple[pd.DataFrame, List[Tuple[str, str]]]:
+    """
+    Wide price frame of `n_tickers` columns (T000, T001, ...) in the shape
+    download_prices returns.
+
+    About `coint_fraction` of the tickers come in planted pairs: the second
+    ticker of each pair is a random multiple of the first plus a
+    mean-reverting spread. The rest are independent random walks.
+
+    returns (prices, planted) where planted lists the (x, y) pairs.
+    """
+    rng = np.random.default_rng(seed)
+    names = [f"T{i:03d}" for i in range(n_tickers)]
+    n_pairs = int(n_tickers * coint_fraction) // 2
+    columns = {}
+    planted = []
+    for k in range(n_pairs):
+        x_name, y_name = names[2 * k], names[2 * k + 1]
+        x = _random_walk(rng, n_bars, rng.uniform(20, 200), vol)
+        beta = rng.uniform(0.5, 2.0)
+        alpha = rng.uniform(0.0, 20.0)
+        columns[x_name] = x
+        columns[y_name] = alpha + beta * x + _ou(rng, n_bars, mean_reversion, noise)
+        planted.append((x_name, y_name))
+    for name in names[2 * n_pairs:]:
+        columns[name] = _random_walk(rng, n_bars, rng.uniform(20, 200), vol)
+    prices = pd.DataFrame(columns, index=_index(n_bars, start, freq))[names]
+    return prices, planted
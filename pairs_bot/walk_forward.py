@@ -0,0 +1,174 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from pairs_bot.fingerprint import cache_key, frame_fingerprint
+from pairs_bot.metrics import infer_periods_per_year, performance_metrics
+from pairs_bot.pairs_selection import find_cointegrated_pairs
+from pairs_bot.portfolio_backtest import backtest_pairs
+
+
+class WalkForwardCache:
+    """
+    Per-window scan results and finished trading-window returns, in memory and
+    optionally as JSON files under `cache_dir`. Entries are keyed by a hash of
+    the window's prices and parameters, so changed data never hits a stale
+    entry.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._mem: Dict[str, object] = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, key: str):
+        if key in self._mem:
+            return self._mem[key]
+        if self.cache_dir is not None:
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            if os.path.exists(path):
+                with open(path) as f:
+                    self._mem[key] = json.load(f)
+                return self._mem[key]
+        return None
+
+    def put(self, key: str, value) -> None:
+        self._mem[key] = value
+        if self.cache_dir is not None:
+            tmp = os.path.join(self.cache_dir, f"{key}.json.tmp")
+            with open(tmp, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp, os.path.join(self.cache_dir, f"{key}.json"))
+
+
+def _window_returns(
+    prices: pd.DataFrame,
+    pairs: List[Dict],
+    warm_start: int,
+    trade_start: int,
+    trade_end: int,
+    params: Dict,
+) -> pd.Series:
+    trade_index = prices.index[trade_start:trade_end]
+    if not pairs:
+        return pd.Series(0.0, index=trade_index)
+    window = prices.iloc[warm_start:trade_end]
+    result = backtest_pairs(
+        window,
+        [(p["x"], p["y"]) for p in pairs],
+        trade_from=trade_index[0],
+        **params,
+    )
+    # the bar before trade_start anchors the first trading-day return
+    equity = result["portfolio"]["equity"].iloc[trade_start - warm_start - 1:]
+    return equity.pct_change().iloc[1:]
+
+
+def walk_forward(
+    prices: pd.DataFrame,
+    formation: int = 504,
+    trading: int = 126,
+    lookback: int = 60,
+    entry_z: float = 2.0,
+    exit_z: float = 0.5,
+    stop_z: float = 4.0,
+    initial_capital: float = 100000,
+    tc_bps: float = 2.0,
+    max_pairs: Optional[int] = None,
+    scan_kwargs: Optional[Dict] = None,
+    cache: Optional[WalkForwardCache] = None,
+) -> Dict:
+    """
+    Walk-forward pair selection with out-of-sample trading.
+
+    Windows are anchored at the first row of `prices`: window k forms on rows
+    [k * trading, k * trading + formation) and trades the following `trading`
+    rows (the last window may be partial). Pairs are picked by
+    find_cointegrated_pairs on the formation rows only (best `max_pairs` by
+    p-value), then backtested with backtest_pairs on the trading rows, using
+    the last 2 * lookback - 1 formation rows to warm up the spread, so the
+    trading rows get the z-scores of the continuous history. Positions start
+    flat in every window.
+
+    Window boundaries do not move when rows are appended, so with a `cache`
+    an extended rerun reuses every earlier scan and every finished trading
+    window, and only scans or trades what is new.
+
+    returns
+    -------
+    {
+        "equity": Series,       # stitched out-of-sample equity
+        "returns": Series,
+        "stats": Dict,          # performance_metrics of the equity (no trade stats)
+        "windows": List[Dict],  # formation/trading dates and pairs per window
+    }
+    """
+    scan_kwargs = dict(scan_kwargs or {})
+    cache = cache if cache is not None else WalkForwardCache()
+    params = {
+        "lookback": lookback,
+        "entry_z": entry_z,
+        "exit_z": exit_z,
+        "stop_z": stop_z,
+        "initial_capital": initial_capital,
+        "tc_bps": tc_bps,
+    }
+    min_samples = scan_kwargs.get("min_samples", 200)
+
+    windows: List[Dict] = []
+    pieces: List[pd.Series] = []
+    n = len(prices)
+    start = 0
+    while start + formation < n:
+        form_end = start + formation
+        trade_end = min(form_end + trading, n)
+        form_prices = prices.iloc[start:form_end]
+
+        scan_key = cache_key("scan", frame_fingerprint(form_prices), scan_kwargs, max_pairs)
+        pairs = cache.get(scan_key)
+        if pairs is None:
+            candidates = form_prices.dropna(axis=1, thresh=min_samples)
+            pairs = find_cointegrated_pairs(candidates, **scan_kwargs)[:max_pairs]
+            cache.put(scan_key, pairs)
+
+        # the first trading row's z-score needs `lookback` spreads, each with
+        # a full `lookback`-row hedge window
+        warm_start = max(start, form_end - (2 * lookback - 1))
+        complete = trade_end - form_end == trading
+        trade_key = None
+        if complete:
+            trade_slice = prices.iloc[warm_start:trade_end]
+            trade_key = cache_key("trade", frame_fingerprint(trade_slice), scan_key, params)
+        cached = cache.get(trade_key) if trade_key else None
+        if cached is not None:
+            returns = pd.Series(cached, index=prices.index[form_end:trade_end])
+        else:
+            returns = _window_returns(prices, pairs, warm_start, form_end, trade_end, params)
+            if trade_key:
+                cache.put(trade_key, returns.tolist())
+
+        pieces.append(returns)
+        windows.append({
+            "formation_start": prices.index[start],
+            "formation_end": prices.index[form_end - 1],
+            "trade_start": prices.index[form_end],
+            "trade_end": prices.index[trade_end - 1],
+            "pairs": pairs,
+        })
+        start += trading
+
+    returns = pd.concat(pieces) if pieces else pd.Series(dtype=float)
+    equity = initial_capital * (1 + returns).cumprod()
+    stats = (
+        performance_metrics(equity, trading_days=infer_periods_per_year(prices.index))
+        if len(equity) else {}
+    )
+    return {
+        "equity": equity,
+        "returns": returns,
+        "stats": stats,
+        "windows": windows,
+    }
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pairs_bot.backtest import backtest_pair
+from pairs_bot.signals import generate_signals
+from pairs_bot.spread_model import build_spread
+from pairs_bot.synthetic import cointegrated_pair
+
+
+def _reference_backtest(df, initial_capital=100000, tc_bps=2.0):
+    # the per-row loop backtest_pair ran before backtest_arrays
+    df = df.copy().dropna(subset=["position"])
+    df["ret_X"] = df["X"].pct_change().fillna(0.0)
+    df["ret_Y"] = df["Y"].pct_change().fillna(0.0)
+
+    equities = [initial_capital]
+    pos_Y = [0.0]
+    pos_X = [0.0]
+    tc = tc_bps / 10000
+    tc_costs = [0.0]
+    for i in range(1, len(df)):
+        equity_now = equities[-1]
+        notional = min(equity_now, initial_capital * 1.2)
+        pos_Y.append(df["position"].iloc[i] * notional)
+        pos_X.append(-df["position"].iloc[i] * df["beta"].iloc[i] * notional)
+        pnl_y = pos_Y[-2] * df["ret_Y"].iloc[i]
+        pnl_x = pos_X[-2] * df["ret_X"].iloc[i]
+        trade_cost = -tc * (abs(pos_Y[-1] - pos_Y[-2]) + abs(pos_X[-1] - pos_X[-2]))
+        tc_costs.append(trade_cost)
+        equities.append(equity_now + pnl_y + pnl_x + trade_cost)
+
+    return pd.DataFrame(
+        {"pos_Y": pos_Y, "pos_X": pos_X, "tc": tc_costs, "equity": equities}, index=df.index,
+    )
+
+
+@pytest.mark.parametrize("seed", [1, 7])
+def test_kernel_matches_reference_loop(seed):
+    pair = cointegrated_pair(n_bars=3000, seed=seed)
+    signals = generate_signals(build_spread(pair, 60))
+    ref = _reference_backtest(signals)
+    out = backtest_pair(signals)["df"]
+
+    assert (out["position"] != 0).any()
+    pd.testing.assert_index_equal(out.index, ref.index)
+    for col in ("pos_Y", "pos_X", "tc", "equity"):
+        np.testing.assert_array_equal(out[col].to_numpy(), ref[col].to_numpy(), err_msg=col)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.stattools import adfuller, coint
+
+from pairs_bot.coint_tests import adf_test, engle_granger
+
+# stat is the same regression solved another way; p-values are interpolated
+# on a tabulated MacKinnon surface (~1e-6 away from the p = 1 cutoff)
+STAT_RTOL = 1e-8
+PVALUE_ATOL = 1e-5
+
+
+def _series(kind, n, seed):
+    rng = np.random.default_rng(seed)
+    eps = rng.normal(size=n)
+    if kind == "random_walk":
+        return 100 + np.cumsum(eps)
+    if kind == "ar1":
+        out = np.zeros(n)
+        for t in range(1, n):
+            out[t] = 0.9 * out[t - 1] + eps[t]
+        return out
+    if kind == "trend":
+        return 0.05 * np.arange(n) + np.cumsum(0.5 * eps)
+    raise ValueError(kind)
+
+
+def _pair(kind, n, seed):
+    rng = np.random.default_rng(seed)
+    x = 50 + np.cumsum(rng.normal(size=n))
+    if kind == "cointegrated":
+        y = 3 + 1.5 * x + _series("ar1", n, seed + 100)
+    else:
+        y = 80 + np.cumsum(rng.normal(size=n))
+    return y, x
+
+
+SERIES = [(k, n, s) for k in ("random_walk", "ar1", "trend") for n in (120, 500) for s in (0, 1, 2)]
+PAIRS = [(k, n, s) for k in ("cointegrated", "independent") for n in (150, 600) for s in (0, 1, 2)]
+
+
+@pytest.mark.parametrize("regression", ["c", "n"])
+@pytest.mark.parametrize("kind,n,seed", SERIES)
+def test_adf_autolag_matches_statsmodels(kind, n, seed, regression):
+    x = _series(kind, n, seed)
+    stat, pvalue, lag = adf_test(x, regression=regression)
+    ref = adfuller(x, regression=regression, autolag="AIC")
+
+    assert lag == ref[2]
+    np.testing.assert_allclose(stat, ref[0], rtol=STAT_RTOL)
+    np.testing.assert_allclose(pvalue, ref[1], atol=PVALUE_ATOL)
+
+
+@pytest.mark.parametrize("maxlag", [0, 3])
+@pytest.mark.parametrize("kind,n,seed", SERIES[::3])
+def test_adf_fixed_lag_matches_statsmodels(kind, n, seed, maxlag):
+    x = _series(kind, n, seed)
+    stat, pvalue, lag = adf_test(x, maxlag=maxlag, autolag=None)
+    ref = adfuller(x, maxlag=maxlag, autolag=None)
+
+    assert lag == ref[2] == maxlag
+    np.testing.assert_allclose(stat, ref[0], rtol=STAT_RTOL)
+    np.testing.assert_allclose(pvalue, ref[1], atol=PVALUE_ATOL)
+
+
+@pytest.mark.parametrize("kind,n,seed", PAIRS)
+def test_engle_granger_matches_coint(kind, n, seed):
+    y, x = _pair(kind, n, seed)
+    stat, pvalue, alpha, beta, resid = engle_granger(y, x)
+    ref_stat, ref_pvalue, _ = coint(y, x)
+
+    np.testing.assert_allclose(stat, ref_stat, rtol=STAT_RTOL)
+    np.testing.assert_allclose(pvalue, ref_pvalue, atol=PVALUE_ATOL)
+    np.testing.assert_allclose(resid, y - (alpha + beta * x))
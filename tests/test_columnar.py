@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from pairs_bot.backtest import backtest_pair
+from pairs_bot.columnar import run_pipeline
+from pairs_bot.signals import generate_signals
+from pairs_bot.spread_model import build_spread
+from pairs_bot.synthetic import cointegrated_pair
+
+
+@pytest.fixture(scope="module")
+def minute_pair():
+    return cointegrated_pair(n_bars=40_000, seed=7, freq="min")
+
+
+@pytest.mark.parametrize("lookback", [60, 3000])
+def test_pipeline_matches_frames(minute_pair, lookback):
+    ref = backtest_pair(generate_signals(build_spread(minute_pair, lookback)))["df"]
+    out = run_pipeline(minute_pair, lookback, chunk_rows=8192)
+    store = out["store"][out["index"].get_indexer(ref.index)]
+
+    np.testing.assert_array_equal(store["position"], ref["position"].to_numpy())
+    np.testing.assert_allclose(store["equity"], ref["equity"].to_numpy(), rtol=1e-6)
+    np.testing.assert_allclose(store["beta"], ref["beta"].to_numpy(), rtol=1e-5)
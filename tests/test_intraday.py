@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from pairs_bot.backtest import backtest_pair
+from pairs_bot.intraday import backtest_pair_chunked
+from pairs_bot.signals import generate_signals
+from pairs_bot.spread_model import build_spread
+from pairs_bot.synthetic import cointegrated_pair
+
+
+@pytest.fixture(scope="module")
+def minute_pair():
+    return cointegrated_pair(n_bars=40_000, seed=7, freq="min")
+
+
+# lookback 3000 > spread_model._SEGMENT / 2: the 2 * lookback - 1 warm-up spans two segments
+@pytest.mark.parametrize("lookback", [60, 3000])
+def test_chunked_matches_unchunked(minute_pair, lookback):
+    ref = backtest_pair(generate_signals(build_spread(minute_pair, lookback)))["df"]
+    out = backtest_pair_chunked(minute_pair, lookback, chunk_rows=8192)["df"].loc[ref.index]
+
+    np.testing.assert_array_equal(out["position"].to_numpy(), ref["position"].to_numpy())
+    np.testing.assert_allclose(out["equity"].to_numpy(), ref["equity"].to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(out["zscore"].to_numpy(), ref["zscore"].to_numpy(), rtol=1e-5)
@@ -0,0 +1,20 @@
+import pytest
+
+from pairs_bot.pairs_selection import cluster_candidates, pruning_report
+from pairs_bot.synthetic import synthetic_universe
+
+# measured on these seeded universes: recall 0.75 (seed 0) and 1.0 (seed 1)
+MIN_RECALL = 0.7
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_cluster_candidates_keep_planted_pairs(seed):
+    prices, planted = synthetic_universe(n_tickers=24, n_bars=1000, seed=seed)
+    candidates = cluster_candidates(prices)
+    report = pruning_report(prices, candidates, planted=planted, min_corr=0.6, n_jobs=1)
+
+    assert set(planted) <= set(candidates)
+    assert report["planted_recall"] == 1.0
+    # the exhaustive scan also finds chance pairs; pruning may miss a few of those
+    assert report["exhaustive_found"] >= len(planted)
+    assert report["recall"] >= MIN_RECALL
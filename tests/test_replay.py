@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from pairs_bot.live.replay import ReplayBroker, replay_pair
+from pairs_bot.synthetic import cointegrated_pair
+
+
+def test_order_cancelled_in_flight_never_fills():
+    bars = pd.DataFrame({"AAA": np.linspace(10, 11, 5)})
+    broker = ReplayBroker(bars=bars, cash=1000.0, latency_bars=2)
+    order = broker.submit_order(symbol="AAA", qty=10, side="buy")
+    broker.cancel_order(order.id)
+    while broker.advance():
+        pass
+
+    assert order.status == "canceled"
+    assert broker.positions.get("AAA", 0) == 0
+    assert broker.cash == 1000.0
+
+
+def test_latency_does_not_resend_orders_in_flight():
+    pair = cointegrated_pair(1500, seed=3).rename(columns={"X": "AAA", "Y": "BBB"})
+    instant = replay_pair(pair, "BBB", "AAA", 20_000, latency_bars=0)
+    delayed = replay_pair(pair, "BBB", "AAA", 20_000, latency_bars=2)
+
+    for sym in ("BBB", "AAA"):
+        held = delayed["df"][f"pos_{sym}"].abs().max()
+        assert held <= instant["df"][f"pos_{sym}"].abs().max()
+    assert len(delayed["broker"].orders) <= len(instant["broker"].orders)
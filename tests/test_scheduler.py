@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pairs_bot.live.replay import ReplayBroker
+from pairs_bot.live.scheduler import LeggedScheduler
+
+
+@pytest.mark.parametrize("slices", [2, 5])
+def test_twap_counts_children_in_flight(slices):
+    # market children fill two bars after submission
+    bars = pd.DataFrame({"AAA": np.linspace(10, 11, 30), "BBB": np.linspace(20, 19, 30)})
+    broker = ReplayBroker(bars=bars, cash=1e6, latency_bars=2)
+    scheduler = LeggedScheduler(broker, {"AAA": 100, "BBB": -50}, algo="twap", slices=slices)
+    for _ in range(15):
+        if scheduler.step():
+            break
+        broker.advance()
+    # let every queued fill land before looking at positions
+    while broker.advance():
+        pass
+
+    assert scheduler.done
+    assert broker.positions == {"AAA": 100, "BBB": -50}
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from pairs_bot.signals import batch_signal_positions, signal_positions
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_batch_matches_loop(seed):
+    rng = np.random.default_rng(seed)
+    z = rng.normal(0.0, 2.0, (2000, 4))
+    z[rng.random(z.shape) < 0.02] = np.nan
+    out = batch_signal_positions(z, 2.0, 0.5, 4.0)
+    for c in range(z.shape[1]):
+        np.testing.assert_array_equal(out[:, c], signal_positions(z[:, c], 2.0, 0.5, 4.0))
+
+
+def test_empty_block():
+    ref = signal_positions(np.array([]), 2.0, 0.5, 4.0)
+    out = batch_signal_positions(np.array([]), 2.0, 0.5, 4.0)
+    assert out.shape == ref.shape == (0,)
+    assert out.dtype == ref.dtype
+    assert batch_signal_positions(np.empty((0, 3)), 2.0, 0.5, 4.0).shape == (0, 3)
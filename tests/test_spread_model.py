@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from pairs_bot.spread_model import ROLLING_OLS_RTOL, build_spread
+from pairs_bot.synthetic import cointegrated_pair
+
+
+@pytest.mark.parametrize("lookback", [60, 120, 250])
+@pytest.mark.parametrize("seed", [0, 2, 5])
+def test_rolling_matches_lstsq_reference(seed, lookback):
+    pair = cointegrated_pair(n_bars=3000, seed=seed)
+    fast = build_spread(pair, lookback, method="rolling")
+    ref = build_spread(pair, lookback, method="lstsq")
+
+    assert fast.index.equals(ref.index)
+    for col in ("alpha", "beta", "spread", "zscore"):
+        a = fast[col].to_numpy()
+        b = ref[col].to_numpy()
+        np.testing.assert_array_equal(np.isnan(a), np.isnan(b), err_msg=col)
+        gap = np.abs(a - b) / np.maximum(1.0, np.abs(b))
+        assert np.nanmax(gap) <= ROLLING_OLS_RTOL, col